@@ -1,5 +1,10 @@
 # FILE: app/database.py
-from sqlalchemy import create_engine, text
+import asyncio
+import time
+from typing import Dict
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -14,42 +19,153 @@ DB_USER = os.getenv("DB_USER", "root")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 DB_NAME = os.getenv("DB_NAME", "test")
 
-# Crear la URL de conexión
-DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+# Crear la URL de conexión (se puede sobrescribir, p. ej. con SQLite para pruebas locales)
+DATABASE_URL = os.getenv(
+    "DATABASE_URL", f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+)
+# URL del driver asíncrono (aiomysql en producción, aiosqlite en local)
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+)
+
+# Pool de conexiones (solo MySQL; SQLite usa la configuración por defecto)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Debe ser menor que wait_timeout del servidor MySQL (28800 s por defecto)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Conexiones que se abren al iniciar la aplicación
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", str(DB_POOL_SIZE)))
+
+
+def _engine_options(url: str, connect_args: dict) -> dict:
+    """Opciones de pool y conexión; SQLite usa la configuración por defecto."""
+    if url.startswith("sqlite"):
+        return {"echo": False}
+    return {
+        # Pool de conexiones
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,  # Reciclar conexiones antes del timeout del servidor
+        "pool_pre_ping": DB_POOL_PRE_PING,  # Verificar conexión antes de usar
+        # Configuración específica para MySQL optimizada
+        "connect_args": connect_args,
+        # Configuración adicional para rendimiento
+        "echo": False,  # Desactivar logging SQL para mejor rendimiento
+    }
+
 
 # Crear el motor de conexión con configuración optimizada
 engine = create_engine(
     DATABASE_URL,
-    # Pool de conexiones optimizado
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=10,  # Reducido para respuesta más rápida
-    pool_recycle=4,  # Reciclar conexiones cada 4 seg (antes de timeout del servidor)
-    pool_pre_ping=True,  # Verificar conexión antes de usar
-    # Configuración específica para MySQL optimizada
-    connect_args={
+    **_engine_options(DATABASE_URL, {
         "autocommit": False,
         "connect_timeout": 5,  # Timeout más corto
         "read_timeout": 10,
         "write_timeout": 10,
-    },
-    # Configuración adicional para rendimiento
-    echo=False,  # Desactivar logging SQL para mejor rendimiento
+    }),
+)
+
+# Motor asíncrono: las consultas no bloquean el event loop de uvicorn
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_engine_options(ASYNC_DATABASE_URL, {
+        "autocommit": False,
+        "connect_timeout": 5,
+    }),
 )
 
 # Crear una sesión de base de datos
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession,
+                                       autoflush=False, expire_on_commit=False)
 
 # Base para los modelos
 Base = declarative_base()
 
-# Dependencia para obtener la sesión de la base de datos
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
\ No newline at end of file
+
+class PoolStats:
+    """Telemetría del pool de conexiones de un engine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.connects = 0        # conexiones DBAPI abiertas (iniciales, recicladas o reconexiones)
+        self.invalidations = 0   # conexiones descartadas por desconexión o pre-ping fallido
+        self.checkouts = 0
+        self.wait_seconds = 0.0  # tiempo total esperando una conexión utilizable
+        self.max_wait_seconds = 0.0
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "checkout", self._on_checkout)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_seconds += seconds
+        if seconds > self.max_wait_seconds:
+            self.max_wait_seconds = seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        pool = self.engine.pool
+        # NullPool/StaticPool no llevan estas cuentas
+        size = pool.size() if hasattr(pool, "size") else 0
+        return {
+            "size": size,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+            # QueuePool reporta overflow negativo mientras no se llena el pool base
+            "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "checkouts": self.checkouts,
+            "wait_seconds": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+# Solo el engine asíncrono atiende peticiones; el síncrono es de los CLI (simulate.py, migrate.py)
+async_pool_stats = PoolStats(async_engine.sync_engine)
+
+
+async def prewarm_pool(connections: int = DB_POOL_PREWARM) -> int:
+    """Abre hasta `connections` conexiones del pool asíncrono y las deja disponibles en él."""
+    pool = async_engine.pool
+    if hasattr(pool, "size"):
+        connections = min(connections, pool.size())
+    if connections <= 0:
+        return 0
+    pending = [async_engine.connect() for _ in range(connections)]
+    results = await asyncio.gather(*(connection.start() for connection in pending), return_exceptions=True)
+    opened = [connection for connection, result in zip(pending, results) if not isinstance(result, BaseException)]
+    for connection in opened:
+        await connection.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(opened)
+
+
+# Dependencia asíncrona para los endpoints async
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        try:
+            # Se toma la conexión al inicio para medir la espera por el pool
+            started = time.perf_counter()
+            try:
+                await db.connection()
+                async_pool_stats.record_wait(time.perf_counter() - started)
+            except SQLAlchemyError:
+                pass  # El endpoint reporta el error de conexión en su primera consulta
+            yield db
+        except Exception as e:
+            await db.rollback()
+            raise e
\ No newline at end of file
@@ -1,29 +1,107 @@
-from fastapi import FastAPI, Depends
-from sqlalchemy.orm import Session
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.database import get_db
-from app.routers import flights_router
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, engine, get_async_db, prewarm_pool
+from app.routers import flights_router, metrics_router, snapshot_router
+from app.services.batch import shutdown_process_pool
+from app.services.layout_cache import seat_layout_cache
+from app.services.snapshot import snapshot_store
+from app.utils.metrics import (
+    DB_QUERIES, DB_SECONDS, REQUEST_SECONDS, instrument_engine, start_request_tracking
+)
+
+logger = logging.getLogger(__name__)
+
+# Cargar las distribuciones de todos los aviones al iniciar
+PRELOAD_LAYOUTS = os.getenv("PRELOAD_LAYOUTS", "true").lower() == "true"
+
+
+def preload_shared_state() -> int:
+    """Carga el estado de solo lectura (distribuciones y snapshot) en el proceso actual.
+
+    Pensada para el proceso maestro de gunicorn antes de crear los workers: las páginas quedan
+    compartidas entre ellos (copy-on-write). Retorna cuántas distribuciones cargó.
+    """
+    if snapshot_store is not None:
+        snapshot_store.reload()
+    if not PRELOAD_LAYOUTS:
+        return 0
+    with SessionLocal() as db:
+        loaded = seat_layout_cache.preload(db)
+    # Las conexiones abiertas no se deben heredar entre procesos
+    engine.dispose()
+    return loaded
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Precalienta el pool de conexiones y las distribuciones antes de recibir tráfico."""
+    if snapshot_store is not None and snapshot_store.current() is None:
+        logger.warning("Snapshot %s no disponible; se reintentará en cada revisión", snapshot_store.path)
+    try:
+        opened = await prewarm_pool()
+        loaded = 0
+        # Con las distribuciones ya cargadas antes del fork, se conservan las compartidas
+        if PRELOAD_LAYOUTS and not seat_layout_cache.stats()["size"]:
+            async with AsyncSessionLocal() as db:
+                loaded = await seat_layout_cache.preload_async(db)
+        logger.info("Pool precalentado con %d conexiones, %d distribuciones cargadas", opened, loaded)
+    except Exception as e:
+        # Sin base de datos la API igual inicia; /health reporta el problema
+        logger.warning("No se pudo precalentar la base de datos: %s", e)
+    yield
+    shutdown_process_pool()
+    await async_engine.dispose()
+
 
 # Crear la aplicación FastAPI
 app = FastAPI(
     title="[Bsale Challenge] Flight Check-in API",
     description="API para simulación de check-in de vuelos con asignación automática de asientos",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Incluir los routers
+if snapshot_store is not None:
+    # Modo snapshot: registrado antes para atender GET /flights/{flight_id}/passengers sin BD
+    app.include_router(snapshot_router, tags=["flights"])
 app.include_router(flights_router, tags=["flights"])
+app.include_router(metrics_router, tags=["metrics"])
+
+# Cantidad y tiempo de consultas por petición
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Registra duración de la petición y consultas a la BD realizadas durante ella."""
+    queries = start_request_tracking()
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    # La plantilla de la ruta (/flights/{flight_id}/passengers) evita una serie por vuelo
+    path = route.path if route is not None else "unmatched"
+    REQUEST_SECONDS.observe(time.perf_counter() - started, request.method, path, str(response.status_code))
+    DB_QUERIES.observe(queries[0])
+    DB_SECONDS.observe(queries[1])
+    return response
 
 @app.get("/")
 async def root():
     return {"message": "[Bsale Challenge] Flight Check-in API is running - Test GitHub Actions v2"}
 
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Verifica la conexión a la base de datos"""
     try:
         # Ejecutar una query simple para verificar conexión
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
\ No newline at end of file
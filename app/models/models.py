@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -15,6 +15,8 @@ class Airplane(Base):
 
 class BoardingPass(Base):
     __tablename__ = "boarding_pass"
+    # Boarding passes de un vuelo (carga, huella y write-back filtran por flight_id)
+    __table_args__ = (Index("ix_boarding_pass_flight_seat", "flight_id", "seat_id"),)
     
     boarding_pass_id = Column(Integer, primary_key=True, index=True)
     purchase_id = Column(Integer, ForeignKey("purchase.purchase_id"))
@@ -34,7 +36,7 @@ class Flight(Base):
     __tablename__ = "flight"
     
     flight_id = Column(Integer, primary_key=True, index=True)
-    takeoff_date_time = Column(Integer)  # Unix timestamp
+    takeoff_date_time = Column(Integer, index=True)  # Unix timestamp
     takeoff_airport = Column(String(255))
     landing_date_time = Column(Integer)  # Unix timestamp
     landing_airport = Column(String(255))
@@ -67,6 +69,8 @@ class Purchase(Base):
 
 class Seat(Base):
     __tablename__ = "seat"
+    # Distribución de un avión (layout_statement filtra por airplane_id)
+    __table_args__ = (Index("ix_seat_airplane_row_column", "airplane_id", "seat_row", "seat_column"),)
     
     seat_id = Column(Integer, primary_key=True, index=True)
     seat_column = Column(String(1))
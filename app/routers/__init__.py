@@ -1,3 +1,5 @@
 from .flights import router as flights_router
+from .metrics import router as metrics_router
+from .snapshot import router as snapshot_router
 
-__all__ = ["flights_router"]
\ No newline at end of file
+__all__ = ["flights_router", "metrics_router", "snapshot_router"]
\ No newline at end of file
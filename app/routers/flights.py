@@ -1,83 +1,237 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy.orm import Session
+import asyncio
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import DisconnectionError, OperationalError
-from typing import Union
-from app.database import get_db
+from collections import defaultdict
+from typing import Hashable, List, Mapping, Optional, Tuple, Union
+from app.database import AsyncSessionLocal, get_async_db
 from app.models.models import Flight
 from app.schemas.flight_schemas import (
-    PassengerResponse,
-    FlightDataResponse,
     FlightResponse,
     FlightNotFoundResponse,
-    FlightErrorResponse
+    FlightErrorResponse,
+    BatchFlightRequest,
+    BatchFlightResponse
 )
+from app.schemas.serializers import FlightPayload, dumps
 from app.services.seat_assignment import SeatAssignmentService
+from app.services.layout_cache import AirplaneLayout, seat_layout_cache
+from app.services.result_cache import (
+    simulation_cache, etag_matches, flight_etag, flight_fingerprint, flight_version_statement
+)
+from app.services.records import (
+    BoardingPassRecord, FlightRecord, PriorAssignment, boarding_pass_rows_statement, flight_rows_statement
+)
+from app.services.batch import assign_flights
+from app.services.coalescing import flight_simulations
+from app.services.optimizer import OPTIMIZER_BUDGET_MS
+from app.services.write_back import PERSIST_ASSIGNMENTS, persist_assignments, unassigned_ids
+from app.utils.metrics import PASSENGERS_PROCESSED, SEATS_PROCESSED, profiler, record_assignment
 
 router = APIRouter()
 
+# Máximo de vuelos por petición en lote
+BATCH_MAX_FLIGHTS = 500
+
+# Tipo de contenido del modo streaming (una línea JSON por registro)
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+JSON_MEDIA_TYPE = "application/json"
+
+# Reutilizar la simulación anterior del vuelo y asignar solo los boarding passes nuevos
+INCREMENTAL_ASSIGNMENT = os.getenv("INCREMENTAL_ASSIGNMENT", "false").lower() == "true"
+
+# El resultado no queda determinado por la versión del vuelo: el ETag incluye un hash del contenido
+CONTENT_ETAG = INCREMENTAL_ASSIGNMENT or OPTIMIZER_BUDGET_MS > 0
+
+
+def _wants_stream(request: Request, stream: bool) -> bool:
+    """El modo streaming se activa con ?stream=true o con Accept: application/x-ndjson."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _assign_seats(boarding_passes: List[BoardingPassRecord], layout: AirplaneLayout,
+                  prior: Optional[Mapping[int, PriorAssignment]] = None) -> List[BoardingPassRecord]:
+    """Simula la asignación de asientos y publica sus tiempos por fase.
+
+    Con `prior` (modo incremental) se conservan los asientos anteriores y solo se ubica lo nuevo.
+    """
+    service = SeatAssignmentService()
+    with profiler.section(f"asignación de asientos (avión {layout.airplane_id})"):
+        if prior is None:
+            boarding_passes = service.assign_seats(boarding_passes, layout)
+        else:
+            boarding_passes = service.assign_incremental(boarding_passes, layout, prior)
+    record_assignment(service.timings, len(boarding_passes), len(layout.seats))
+    return boarding_passes
+
+
+def _simulate_flight(flight: FlightRecord, boarding_passes: List[BoardingPassRecord], layout: AirplaneLayout,
+                     prior: Optional[Mapping[int, PriorAssignment]] = None, stream_mode: bool = False) -> FlightPayload:
+    """Asigna asientos y construye la respuesta (trabajo de CPU, se ejecuta fuera del event loop).
+
+    En modo streaming los pasajeros se arman y serializan de a uno al enviarse (sin cuerpo JSON).
+    """
+    # Simular asignación de asientos
+    boarding_passes = _assign_seats(boarding_passes, layout, prior)
+    payload = FlightPayload.from_boarding_passes(flight, boarding_passes, lazy=True)
+    if not stream_mode:
+        payload.body()
+    return payload
+
+
+async def _compute_flight(flight: FlightRecord, fingerprint, stream_mode: bool) -> Tuple[Hashable, FlightPayload]:
+    """Carga, simula y cachea una versión del vuelo con su propia sesión (ejecución compartida).
+
+    Retorna la huella con la que quedó cacheado el resultado (cambia si se persistieron asientos).
+    """
+    async with AsyncSessionLocal() as db:
+        # Cargar boarding passes por columnas (sin entidades ORM) sin bloquear el event loop
+        boarding_passes = [
+            BoardingPassRecord.from_row(row)
+            for row in await db.execute(boarding_pass_rows_statement(flight.flight_id))
+        ]
+        layout = await seat_layout_cache.get_or_load_async(db, flight.airplane_id)
+        pending = unassigned_ids(boarding_passes) if PERSIST_ASSIGNMENTS else set()
+        prior = None
+        if INCREMENTAL_ASSIGNMENT:
+            # Base: la última simulación cacheada (o, si no hay, los asientos ya persistidos)
+            previous = simulation_cache.latest(flight.flight_id)
+            prior = await run_in_threadpool(previous.assignments) if previous is not None else {}
+
+        # Si no hay boarding passes, el resultado es el vuelo con lista vacía
+        payload = await run_in_threadpool(_simulate_flight, flight, boarding_passes, layout, prior, stream_mode)
+        if pending:
+            # Guardado: las próximas lecturas encuentran el vuelo asignado (nueva huella)
+            fingerprint = await persist_assignments(db, flight, fingerprint, boarding_passes, pending) or fingerprint
+    simulation_cache.put(flight.flight_id, fingerprint, payload)
+    return fingerprint, payload
+
+
+def _etag(fingerprint, stream_mode: bool, payload: Optional[FlightPayload]) -> Optional[str]:
+    """ETag de la respuesta; en modo incremental o con optimizador depende también del contenido ya calculado."""
+    variant = "ndjson" if stream_mode else "json"
+    if not CONTENT_ETAG:
+        # La simulación es determinista: basta la versión del vuelo
+        return flight_etag(fingerprint, variant)
+    return flight_etag(fingerprint, variant, payload.digest()) if payload is not None else None
+
+
+async def _render(payload: Optional[FlightPayload], stream_mode: bool) -> None:
+    """Serializa el cuerpo JSON fuera del event loop si la respuesta o el ETag lo necesitan."""
+    if payload is not None and not payload.rendered() and (not stream_mode or CONTENT_ETAG):
+        await run_in_threadpool(payload.body)
 
-@router.get("/flights/{flight_id}/passengers", 
+
+def _payload_response(payload: FlightPayload, stream_mode: bool, etag: Optional[str]) -> Response:
+    headers = {"ETag": etag} if etag else None
+    if stream_mode:
+        return StreamingResponse(payload.iter_ndjson(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    return Response(content=payload.body(), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/flights/{flight_id}/passengers",
            response_model=Union[FlightResponse, FlightNotFoundResponse, FlightErrorResponse])
-async def get_flight_passengers(flight_id: int, response: Response, db: Session = Depends(get_db)):
+async def get_flight_passengers(flight_id: int, request: Request, response: Response, stream: bool = False,
+                                db: AsyncSession = Depends(get_async_db)):
     """
     Obtiene los pasajeros de un vuelo con asientos asignados mediante simulación de check-in.
+
+    Con ?stream=true o Accept: application/x-ndjson la respuesta se envía como NDJSON en streaming.
+    Responde 304 si If-None-Match coincide con el ETag de la versión actual del vuelo.
     """
+    stream_mode = _wants_stream(request, stream)
     try:
-        # Verificar si el vuelo existe
-        flight = db.query(Flight).filter(Flight.flight_id == flight_id).first()
-        if not flight:
+        # Vuelo y huella de sus boarding passes en una sola consulta
+        row = (await db.execute(flight_version_statement(flight_id))).first()
+        if row is None:
             response.status_code = 404
             return FlightNotFoundResponse()
-        
-        # Simular asignación de asientos
-        seat_service = SeatAssignmentService(db)
-        boarding_passes = seat_service.assign_seats_for_flight(flight_id)
-        
-        # Si no hay boarding passes, retornar vuelo con lista vacía
-        if not boarding_passes:
-            flight_data = FlightDataResponse(
-                flight_id=flight.flight_id,
-                takeoff_date_time=flight.takeoff_date_time,
-                takeoff_airport=flight.takeoff_airport,
-                landing_date_time=flight.landing_date_time,
-                landing_airport=flight.landing_airport,
-                airplane_id=flight.airplane_id,
-                passengers=[]
-            )
-            response.status_code = 200
-            return FlightResponse(code=200, data=flight_data)
-        
-        # Convertir a formato de respuesta (snake_case a camelCase) - Base
-        passengers_data = []
-        for bp in boarding_passes:
-            # Crear objeto combinando datos del pasajero y boarding pass
-            passenger_data = PassengerResponse(
-                passenger_id=bp.passenger.passenger_id,
-                dni=bp.passenger.dni,
-                name=bp.passenger.name,
-                age=bp.passenger.age,
-                country=bp.passenger.country,
-                boarding_pass_id=bp.boarding_pass_id,
-                purchase_id=bp.purchase_id,
-                seat_type_id=bp.seat_type_id,
-                seat_id=bp.seat_id
-            )
-            passengers_data.append(passenger_data)
-        
-        # Crear respuesta de datos del vuelo
-        flight_data = FlightDataResponse(
-            flight_id=flight.flight_id,
-            takeoff_date_time=flight.takeoff_date_time,
-            takeoff_airport=flight.takeoff_airport,
-            landing_date_time=flight.landing_date_time,
-            landing_airport=flight.landing_airport,
-            airplane_id=flight.airplane_id,
-            passengers=passengers_data
+        flight = FlightRecord(*row[:6])
+        fingerprint = flight_fingerprint(flight, row[6:])
+
+        # Servir desde cache si los boarding passes del vuelo no cambiaron
+        cached = simulation_cache.get(flight_id, fingerprint)
+        await _render(cached, stream_mode)
+        etag = _etag(fingerprint, stream_mode, cached)
+        # El cliente ya tiene esta versión: sin asignación ni serialización
+        if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        if cached is not None:
+            return _payload_response(cached, stream_mode, etag)
+
+        # Peticiones concurrentes del mismo vuelo y versión comparten una sola simulación;
+        # la conexión de esta petición se libera mientras espera
+        await db.close()
+        fingerprint, payload = await flight_simulations.run(
+            (flight_id, fingerprint), lambda: _compute_flight(flight, fingerprint, stream_mode)
         )
-        
-        response.status_code = 200
-        return FlightResponse(code=200, data=flight_data)
-        
+        # La ejecución compartida pudo iniciarla una petición NDJSON (sin cuerpo JSON)
+        await _render(payload, stream_mode)
+        return _payload_response(payload, stream_mode, _etag(fingerprint, stream_mode, payload))
+
+    except asyncio.TimeoutError:
+        response.status_code = 503
+        return FlightErrorResponse(code=503, errors="timed out waiting for flight simulation")
+    except (DisconnectionError, OperationalError):
+        response.status_code = 400
+        return FlightErrorResponse(code=400, errors="could not connect to db")
+    except Exception as e:
+        response.status_code = 400
+        return FlightErrorResponse(code=400, errors=f"could not connect to db: {str(e)}")
+
+
+@router.post("/flights/passengers:batch",
+            response_model=Union[BatchFlightResponse, FlightErrorResponse])
+async def get_flights_passengers_batch(request: BatchFlightRequest, response: Response,
+                                       db: AsyncSession = Depends(get_async_db)):
+    """
+    Simula el check-in de varios vuelos (por lista de IDs y/o rango de despegue) en una sola petición.
+    """
+    if not request.flight_ids and request.takeoff_from is None and request.takeoff_to is None:
+        response.status_code = 400
+        return FlightErrorResponse(code=400, errors="flightIds or takeoff range required")
+    try:
+        query = flight_rows_statement()
+        if request.flight_ids:
+            query = query.where(Flight.flight_id.in_(request.flight_ids))
+        if request.takeoff_from is not None:
+            query = query.where(Flight.takeoff_date_time >= request.takeoff_from)
+        if request.takeoff_to is not None:
+            query = query.where(Flight.takeoff_date_time <= request.takeoff_to)
+        flights = [FlightRecord(*row) for row in await db.execute(
+            query.order_by(Flight.takeoff_date_time, Flight.flight_id).limit(BATCH_MAX_FLIGHTS + 1)
+        )]
+        if len(flights) > BATCH_MAX_FLIGHTS:
+            response.status_code = 400
+            return FlightErrorResponse(code=400, errors=f"too many flights (max {BATCH_MAX_FLIGHTS})")
+
+        # Una sola consulta por columnas para los boarding passes de todos los vuelos
+        by_flight = defaultdict(list)
+        if flights:
+            rows = (await db.execute(boarding_pass_rows_statement(*[f.flight_id for f in flights]))).all()
+            for row in rows:
+                by_flight[row.flight_id].append(BoardingPassRecord.from_row(row))
+
+        layouts = {}
+        for flight in flights:
+            if flight.airplane_id not in layouts:
+                layouts[flight.airplane_id] = await seat_layout_cache.get_or_load_async(db, flight.airplane_id)
+
+        # Repartir la asignación entre procesos
+        pending = [(layouts[f.airplane_id], by_flight[f.flight_id]) for f in flights if by_flight[f.flight_id]]
+        await assign_flights(pending)
+        # Los tiempos por fase quedan en los procesos worker; aquí solo se cuentan volúmenes
+        PASSENGERS_PROCESSED.inc(sum(len(boarding_passes) for _, boarding_passes in pending))
+        SEATS_PROCESSED.inc(sum(len(layout.seats) for layout, _ in pending))
+
+        body = await run_in_threadpool(lambda: dumps({"code": 200, "data": [
+            FlightPayload.from_boarding_passes(f, by_flight[f.flight_id]).data() for f in flights
+        ]}))
+        return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
     except (DisconnectionError, OperationalError):
         response.status_code = 400
         return FlightErrorResponse(code=400, errors="could not connect to db")
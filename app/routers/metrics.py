@@ -0,0 +1,77 @@
+import hmac
+import os
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response
+from app.database import async_pool_stats
+from app.services.layout_cache import seat_layout_cache
+from app.services.result_cache import simulation_cache
+from app.services.snapshot import snapshot_store
+from app.utils.metrics import metrics, profiler
+
+router = APIRouter()
+
+# Formato de texto de exposición de Prometheus
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Token para cambiar el perfilado en caliente (vacío = solo al arranque con PROFILING_ENABLED)
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+
+# Estadísticas de los caches del proceso, calculadas al momento de exponerlas
+for _name, _label, _cache in (("layout", "distribuciones de asientos", seat_layout_cache),
+                              ("simulation", "simulaciones", simulation_cache)):
+    metrics.gauge(f"checkin_{_name}_cache_hits_total", f"Aciertos del cache de {_label}",
+                  lambda cache=_cache: cache.hits, "counter")
+    metrics.gauge(f"checkin_{_name}_cache_misses_total", f"Fallos del cache de {_label}",
+                  lambda cache=_cache: cache.misses, "counter")
+    metrics.gauge(f"checkin_{_name}_cache_hit_ratio", f"Proporción de aciertos del cache de {_label}",
+                  lambda cache=_cache: cache.stats()["hit_rate"])
+    metrics.gauge(f"checkin_{_name}_cache_entries", f"Entradas en el cache de {_label}",
+                  lambda cache=_cache: cache.stats()["size"])
+
+# Pool de conexiones del motor asíncrono (el que usan los endpoints)
+for _key, _kind, _help in (
+    ("size", "gauge", "Tamaño base del pool de conexiones"),
+    ("checked_out", "gauge", "Conexiones en uso"),
+    ("overflow", "gauge", "Conexiones abiertas por sobre el tamaño base"),
+    ("connects", "counter", "Conexiones abiertas a la base de datos (incluye reciclaje y reconexiones)"),
+    ("invalidations", "counter", "Conexiones descartadas por desconexión"),
+    ("checkouts", "counter", "Conexiones entregadas por el pool"),
+    ("wait_seconds", "counter", "Tiempo total esperando una conexión utilizable"),
+    ("max_wait_seconds", "gauge", "Mayor espera por una conexión"),
+):
+    _suffix = "_total" if _kind == "counter" else ""
+    metrics.gauge(f"checkin_db_pool_{_key}{_suffix}", _help,
+                  lambda key=_key: async_pool_stats.snapshot()[key], _kind)
+
+# Snapshot en modo de solo lectura
+if snapshot_store is not None:
+    metrics.gauge("checkin_snapshot_reloads_total", "Snapshots cargados por el proceso",
+                  lambda: snapshot_store.reloads, "counter")
+    metrics.gauge("checkin_snapshot_flights", "Vuelos en el snapshot vigente",
+                  lambda: len(snapshot_store.current() or ()))
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Métricas del proceso en formato Prometheus."""
+    return Response(content=metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+@router.get("/metrics/pool")
+async def get_pool_stats():
+    """Estado del pool de conexiones, para dimensionarlo según la carga real."""
+    return async_pool_stats.snapshot()
+
+
+@router.post("/metrics/profiling", include_in_schema=bool(PROFILING_TOKEN))
+async def set_profiling(enabled: bool, x_admin_token: Optional[str] = Header(None)):
+    """Activa o desactiva el perfilado (cProfile) de la asignación de asientos por petición.
+
+    Requiere el header X-Admin-Token igual a PROFILING_TOKEN; sin token configurado no existe.
+    """
+    if not PROFILING_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), PROFILING_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="invalid admin token")
+    profiler.enabled = enabled
+    return {"profiling": profiler.enabled}
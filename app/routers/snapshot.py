@@ -0,0 +1,43 @@
+from typing import Union
+from fastapi import APIRouter, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from app.routers.flights import _payload_response, _wants_stream
+from app.schemas.flight_schemas import FlightResponse, FlightNotFoundResponse, FlightErrorResponse
+from app.services.result_cache import etag_matches, flight_etag
+from app.services.snapshot import Snapshot, snapshot_store
+
+router = APIRouter()
+
+
+def _load(snapshot: Snapshot, flight_id: int, stream_mode: bool):
+    """Decodifica el vuelo desde el snapshot (y su cuerpo JSON) fuera del event loop."""
+    payload = snapshot.payload(flight_id)
+    if payload is not None and not stream_mode:
+        payload.body()
+    return payload
+
+
+@router.get("/flights/{flight_id}/passengers",
+           response_model=Union[FlightResponse, FlightNotFoundResponse, FlightErrorResponse])
+async def get_flight_passengers(flight_id: int, request: Request, response: Response, stream: bool = False):
+    """
+    Obtiene los pasajeros de un vuelo desde el snapshot precalculado, sin consultar la base de datos.
+
+    Misma respuesta que el endpoint con base de datos (JSON, NDJSON, ETag y 304).
+    """
+    snapshot = snapshot_store.current()
+    if snapshot is None:
+        response.status_code = 503
+        return FlightErrorResponse(code=503, errors="snapshot not available")
+    if flight_id not in snapshot:
+        response.status_code = 404
+        return FlightNotFoundResponse()
+
+    stream_mode = _wants_stream(request, stream)
+    # Versión: hash de todo el contenido del snapshot, por eso el ETag puede ser fuerte
+    etag = flight_etag(("snapshot", snapshot.content_id, flight_id), "ndjson" if stream_mode else "json",
+                       weak=False)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    payload = await run_in_threadpool(_load, snapshot, flight_id, stream_mode)
+    return _payload_response(payload, stream_mode, etag)
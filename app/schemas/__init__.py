@@ -1,15 +1,25 @@
 from .flight_schemas import (
     PassengerResponse,
+    FlightHeaderResponse,
     FlightDataResponse,
     FlightResponse,
     FlightNotFoundResponse,
-    FlightErrorResponse
+    FlightErrorResponse,
+    BatchFlightRequest,
+    BatchFlightResponse,
+    build_flight_data,
+    build_passenger
 )
 
 __all__ = [
     "PassengerResponse",
-    "FlightDataResponse", 
+    "FlightHeaderResponse",
+    "FlightDataResponse",
     "FlightResponse",
     "FlightNotFoundResponse",
-    "FlightErrorResponse"
+    "FlightErrorResponse",
+    "BatchFlightRequest",
+    "BatchFlightResponse",
+    "build_flight_data",
+    "build_passenger"
 ]
\ No newline at end of file
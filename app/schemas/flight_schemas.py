@@ -24,13 +24,16 @@ class PassengerResponse(CamelCaseModel):
     seat_id: Optional[int] = None
 
 
-class FlightDataResponse(CamelCaseModel):
+class FlightHeaderResponse(CamelCaseModel):
     flight_id: int
     takeoff_date_time: int
     takeoff_airport: str
     landing_date_time: int
     landing_airport: str
     airplane_id: int
+
+
+class FlightDataResponse(FlightHeaderResponse):
     passengers: List[PassengerResponse]
 
 
@@ -46,4 +49,48 @@ class FlightNotFoundResponse(BaseModel):
 
 class FlightErrorResponse(BaseModel):
     code: int = 400
-    errors: str
\ No newline at end of file
+    errors: str
+
+
+class BatchFlightRequest(CamelCaseModel):
+    flight_ids: Optional[List[int]] = None
+    takeoff_from: Optional[int] = None  # Unix timestamp (inclusive)
+    takeoff_to: Optional[int] = None  # Unix timestamp (inclusive)
+
+
+class BatchFlightResponse(BaseModel):
+    code: int
+    data: List[FlightDataResponse]
+
+
+def build_passenger(bp) -> PassengerResponse:
+    """Crea la respuesta de un pasajero combinando datos del pasajero y boarding pass."""
+    return PassengerResponse(
+        passenger_id=bp.passenger.passenger_id,
+        dni=bp.passenger.dni,
+        name=bp.passenger.name,
+        age=bp.passenger.age,
+        country=bp.passenger.country,
+        boarding_pass_id=bp.boarding_pass_id,
+        purchase_id=bp.purchase_id,
+        seat_type_id=bp.seat_type_id,
+        seat_id=bp.seat_id
+    )
+
+
+def build_flight_data(flight, boarding_passes) -> FlightDataResponse:
+    """Construye los datos de respuesta de un vuelo con sus boarding passes ya asignados."""
+    # Convertir a formato de respuesta (snake_case a camelCase) - Base
+    passengers_data = [build_passenger(bp) for bp in boarding_passes]
+
+    # Crear respuesta de datos del vuelo
+    flight_data = FlightDataResponse(
+        flight_id=flight.flight_id,
+        takeoff_date_time=flight.takeoff_date_time,
+        takeoff_airport=flight.takeoff_airport,
+        landing_date_time=flight.landing_date_time,
+        landing_airport=flight.landing_airport,
+        airplane_id=flight.airplane_id,
+        passengers=passengers_data
+    )
+    return flight_data
\ No newline at end of file
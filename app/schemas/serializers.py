@@ -0,0 +1,117 @@
+import hashlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from operator import attrgetter
+from app.schemas.flight_schemas import FlightHeaderResponse, PassengerResponse
+from app.services.records import PriorAssignment
+from app.utils.case_converter import snake_to_camel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+    import json
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa a JSON compacto en UTF-8, con el mismo formato que las respuestas JSON de FastAPI."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+# Campos de PassengerResponse que vienen del pasajero (el resto viene del boarding pass)
+_PASSENGER_FIELDS = {"passenger_id", "dni", "name", "age", "country"}
+
+
+def _compile(model, source: str = "") -> Tuple[Tuple[str, Any], ...]:
+    """Precalcula (clave camelCase, getter) para cada campo del esquema, en su orden."""
+    return tuple(
+        (field.alias or snake_to_camel(name),
+         attrgetter(f"{source}{name}" if not source or name in _PASSENGER_FIELDS else name))
+        for name, field in model.model_fields.items()
+    )
+
+
+_HEADER_FIELDS = _compile(FlightHeaderResponse)
+_PASSENGER_ROW_FIELDS = _compile(PassengerResponse, "passenger.")
+
+
+def header_row(flight) -> dict:
+    """Encabezado del vuelo como dict con claves camelCase."""
+    return {key: getter(flight) for key, getter in _HEADER_FIELDS}
+
+
+def passenger_row(bp) -> dict:
+    """Pasajero (boarding pass + pasajero) como dict con claves camelCase, sin construir modelos Pydantic."""
+    return {key: getter(bp) for key, getter in _PASSENGER_ROW_FIELDS}
+
+
+class FlightPayload:
+    """Resultado serializable de la simulación de un vuelo (respuesta completa o NDJSON).
+
+    Construido con `lazy=True`, conserva los boarding passes y arma los dicts de pasajeros solo
+    si se piden: el streaming NDJSON los genera de a uno sin materializar la lista ni el cuerpo.
+    """
+
+    __slots__ = ("header", "_passengers", "_boarding_passes", "_body", "_digest")
+
+    def __init__(self, header: dict, passengers: Optional[List[dict]] = None,
+                 boarding_passes: Optional[Sequence] = None):
+        self.header = header
+        self._passengers = passengers
+        self._boarding_passes = boarding_passes
+        self._body: Optional[bytes] = None
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def from_boarding_passes(cls, flight, boarding_passes: Iterable, lazy: bool = False) -> "FlightPayload":
+        if lazy:
+            return cls(header_row(flight), boarding_passes=list(boarding_passes))
+        return cls(header_row(flight), [passenger_row(bp) for bp in boarding_passes])
+
+    @property
+    def passengers(self) -> List[dict]:
+        if self._passengers is None:
+            self._passengers = [passenger_row(bp) for bp in self._boarding_passes]
+            self._boarding_passes = None
+        return self._passengers
+
+    def data(self) -> dict:
+        return {**self.header, "passengers": self.passengers}
+
+    def body(self) -> bytes:
+        """Cuerpo equivalente byte a byte a FlightResponse(code=200, data=...) (se calcula una vez)."""
+        if self._body is None:
+            self._body = dumps({"code": 200, "data": self.data()})
+        return self._body
+
+    def rendered(self) -> bool:
+        return self._body is not None
+
+    def digest(self) -> str:
+        """Hash del contenido (se calcula una vez); distingue resultados con la misma huella del vuelo."""
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.body(), digest_size=16).hexdigest()
+        return self._digest
+
+    def iter_ndjson(self) -> Iterator[bytes]:
+        boarding_passes = self._boarding_passes
+        if self._passengers is None and boarding_passes is not None:
+            return iter_ndjson(self.header, (passenger_row(bp) for bp in boarding_passes))
+        return iter_ndjson(self.header, self.passengers)
+
+    def assignments(self) -> Dict[int, PriorAssignment]:
+        """Asientos de esta simulación por boarding_pass_id, como base de una asignación incremental."""
+        return {
+            passenger["boardingPassId"]: PriorAssignment(
+                passenger["purchaseId"], passenger["seatTypeId"], passenger["seatId"])
+            for passenger in self.passengers
+        }
+
+
+def iter_ndjson(header: dict, passengers: Iterable[dict]) -> Iterator[bytes]:
+    """Primera línea con el encabezado del vuelo y luego un pasajero por línea."""
+    yield dumps({"code": 200, "data": header}) + b"\n"
+    for passenger in passengers:
+        yield dumps(passenger) + b"\n"
\ No newline at end of file
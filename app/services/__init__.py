@@ -1,3 +1,6 @@
 from .seat_assignment import SeatAssignmentService
+from .layout_cache import seat_layout_cache
+from .result_cache import simulation_cache
+from .loader import load_flight
 
-__all__ = ["SeatAssignmentService"]
\ No newline at end of file
+__all__ = ["SeatAssignmentService", "seat_layout_cache", "simulation_cache", "load_flight"]
\ No newline at end of file
@@ -0,0 +1,82 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.services.layout_cache import AirplaneLayout
+from app.schemas.serializers import FlightPayload
+from app.services.records import BoardingPassRecord, FlightRecord
+from app.services.seat_assignment import SeatAssignmentService
+
+# Número de procesos para simulaciones en lote (0 o 1 = en el mismo proceso); por defecto se
+# reparten los núcleos entre los workers web, para no levantar núcleos² procesos con gunicorn
+SIMULATION_WORKERS = int(os.getenv(
+    "SIMULATION_WORKERS", str(max(1, (os.cpu_count() or 1) // max(1, int(os.getenv("WEB_WORKERS", "1")))))
+))
+
+# Los procesos no se crean con fork: el worker web tiene hilos (threadpool) que pueden tener locks tomados
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def simulate_assignments(layout: AirplaneLayout, rows: Sequence[Tuple]) -> Dict[int, Optional[int]]:
+    """Ejecuta la asignación de un vuelo a partir de filas mínimas; retorna boarding_pass_id -> seat_id.
+
+    Es una función de nivel de módulo para poder ejecutarse en otro proceso.
+    """
+    boarding_passes = [BoardingPassRecord.from_assignment_row(row) for row in rows]
+    return SeatAssignmentService().assign(boarding_passes, layout)
+
+
+def simulate_flight_payload(flight: FlightRecord, layout: AirplaneLayout, rows: Sequence[Tuple]) -> FlightPayload:
+    """Simula un vuelo completo a partir de filas de boarding_pass_rows_statement.
+
+    Pensada para ejecutarse en procesos worker.
+    """
+    boarding_passes = [BoardingPassRecord.from_row(row) for row in rows]
+    SeatAssignmentService().assign_seats(boarding_passes, layout)
+    return FlightPayload.from_boarding_passes(flight, boarding_passes)
+
+
+def simulate_flight_json(flight: FlightRecord, layout: AirplaneLayout, rows: Sequence[Tuple]) -> bytes:
+    """Simula un vuelo completo y lo serializa como FlightResponse en camelCase (una línea JSON)."""
+    return simulate_flight_payload(flight, layout, rows).body()
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Pool de procesos compartido, creado bajo demanda."""
+    global _pool
+    if SIMULATION_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=SIMULATION_WORKERS,
+                                        mp_context=multiprocessing.get_context(_START_METHOD))
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def assign_flights(flights: List[Tuple[AirplaneLayout, List[BoardingPassRecord]]]) -> None:
+    """Asigna asientos a varios vuelos en paralelo y aplica el resultado sobre los registros."""
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    # Con un solo vuelo no vale la pena serializar hacia otro proceso
+    executor = pool if pool is not None and len(flights) > 1 else None
+    futures = [
+        loop.run_in_executor(executor, simulate_assignments, layout,
+                             [bp.assignment_row() for bp in boarding_passes])
+        for layout, boarding_passes in flights
+    ]
+    for (layout, boarding_passes), assignments in zip(flights, await asyncio.gather(*futures)):
+        for bp in boarding_passes:
+            bp.seat_id = assignments[bp.boarding_pass_id]
\ No newline at end of file
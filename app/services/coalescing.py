@@ -0,0 +1,51 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from app.utils.metrics import metrics
+
+COALESCED_REQUESTS = metrics.counter(
+    "checkin_coalesced_requests_total", "Peticiones que reutilizaron una simulación en curso")
+
+
+class SingleFlight:
+    """Agrupa llamadas concurrentes con la misma clave en una sola ejecución compartida.
+
+    La ejecución corre como una tarea independiente: si el cliente que la inició se
+    desconecta, el resto sigue esperando el resultado. Todos reciben el mismo resultado
+    o la misma excepción; la espera de cada llamada está acotada por `timeout`.
+    """
+
+    def __init__(self, timeout: Optional[float] = 30.0):
+        self.timeout = timeout
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta factory() para la clave, o espera la ejecución en curso con la misma clave.
+
+        Lanza asyncio.TimeoutError si la espera supera el límite (la ejecución continúa).
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            COALESCED_REQUESTS.inc()
+        # shield: que expire la espera o se cancele una petición no cancela la ejecución compartida
+        return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Marca la excepción como leída aunque nadie quede esperando
+        if not task.cancelled():
+            task.exception()
+
+
+# Simulaciones en curso por (flight_id, huella)
+flight_simulations = SingleFlight(
+    timeout=float(os.getenv("COALESCE_TIMEOUT", "30")) or None
+)
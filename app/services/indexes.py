@@ -0,0 +1,136 @@
+import logging
+from typing import Callable, Dict, List, NamedTuple, Tuple, Union
+from sqlalchemy import Index, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.visitors import cloned_traverse
+from app.models.models import BoardingPass, Flight, Seat
+from app.services.layout_cache import layout_statement
+from app.services.records import boarding_pass_rows_statement, flight_rows_statement
+from app.services.result_cache import fingerprint_statement, flight_version_statement
+from app.services.write_back import assignment_update_statement
+
+logger = logging.getLogger(__name__)
+
+
+def _index(table, name: str) -> Index:
+    return next(index for index in table.indexes if index.name == name)
+
+
+# Índices de las consultas calientes (declarados en los modelos)
+HOT_INDEXES: Tuple[Index, ...] = (
+    _index(BoardingPass.__table__, "ix_boarding_pass_flight_seat"),
+    _index(Seat.__table__, "ix_seat_airplane_row_column"),
+    _index(Flight.__table__, "ix_flight_takeoff_date_time"),
+)
+
+
+class PlanStep(NamedTuple):
+    """Paso del plan de ejecución; `full_scan` indica un recorrido completo de la tabla."""
+    table: str
+    detail: str
+    full_scan: bool
+
+
+def _hot_queries(flight_id: int, airplane_id: int, takeoff: int) -> Dict[str, object]:
+    """Las consultas que ejecuta el servicio por petición, con valores de ejemplo."""
+    return {
+        "flight_version": flight_version_statement(flight_id),
+        "fingerprint": fingerprint_statement(flight_id),
+        "boarding_passes": boarding_pass_rows_statement(flight_id),
+        "layout": layout_statement(airplane_id),
+        "batch_flights": flight_rows_statement().where(
+            Flight.takeoff_date_time >= takeoff, Flight.takeoff_date_time <= takeoff
+        ),
+        "write_back": _with_values(assignment_update_statement(),
+                                   b_boarding_pass_id=0, b_flight_id=flight_id, b_seat_id=0),
+    }
+
+
+def _with_values(statement, **values):
+    """Copia del statement con valor en sus bindparam (UPDATE no admite .params())."""
+    def visit_bindparam(bind):
+        if bind.key in values:
+            bind.value = values[bind.key]
+            bind.required = False
+    return cloned_traverse(statement, {}, {"bindparam": visit_bindparam})
+
+
+def _sample_ids(conn: Connection) -> Tuple[int, int, int]:
+    """Vuelo con boarding passes, su avión y su despegue (planes sobre datos reales)."""
+    row = conn.execute(
+        select(Flight.flight_id, Flight.airplane_id, Flight.takeoff_date_time).where(
+            Flight.flight_id == select(func.min(BoardingPass.flight_id)).scalar_subquery()
+        )
+    ).first()
+    return tuple(row) if row is not None else (1, 1, 0)
+
+
+def _sqlite_plan(conn: Connection, sql: str) -> List[PlanStep]:
+    steps = []
+    for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[-1]
+        words = detail.split()
+        # "SCAN t" (con o sin COVERING INDEX) recorre toda la tabla; "SEARCH t USING ..." no
+        if words[0] in ("SCAN", "SEARCH") and len(words) > 1:
+            steps.append(PlanStep(words[1], detail, words[0] == "SCAN"))
+    return steps
+
+
+def _mysql_plan(conn: Connection, sql: str) -> List[PlanStep]:
+    steps = []
+    for row in conn.exec_driver_sql(f"EXPLAIN {sql}").mappings():
+        if row["table"] is None:
+            continue
+        # ALL: recorrido de la tabla; index: recorrido completo de un índice
+        steps.append(PlanStep(row["table"], f"type={row['type']} key={row['key']}", row["type"] in ("ALL", "index")))
+    return steps
+
+
+PLANNERS: Dict[str, Callable[[Connection, str], List[PlanStep]]] = {
+    "sqlite": _sqlite_plan,
+    "mysql": _mysql_plan,
+}
+
+
+def explain_hot_queries(engine: Engine) -> Dict[str, List[PlanStep]]:
+    """Plan de ejecución de cada consulta caliente (SQLite: EXPLAIN QUERY PLAN, MySQL: EXPLAIN)."""
+    planner = PLANNERS.get(engine.dialect.name)
+    if planner is None:
+        raise ValueError(f"dialecto no soportado: {engine.dialect.name}")
+    with engine.connect() as conn:
+        queries = _hot_queries(*_sample_ids(conn))
+        return {
+            name: planner(conn, str(statement.compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )))
+            for name, statement in queries.items()
+        }
+
+
+def full_scans(plans: Dict[str, List[PlanStep]]) -> Dict[str, List[PlanStep]]:
+    """Consultas con algún recorrido completo de tabla."""
+    return {name: [step for step in steps if step.full_scan]
+            for name, steps in plans.items() if any(step.full_scan for step in steps)}
+
+
+def missing_indexes(bind: Union[Engine, Connection]) -> List[Index]:
+    """Índices calientes que no existen (por nombre ni por las mismas columnas)."""
+    inspector = inspect(bind)
+    missing = []
+    for index in HOT_INDEXES:
+        existing = inspector.get_indexes(index.table.name)
+        columns = [column.name for column in index.columns]
+        if not any(found["name"] == index.name or found["column_names"] == columns for found in existing):
+            missing.append(index)
+    return missing
+
+
+def create_indexes(engine: Engine) -> List[str]:
+    """Crea los índices calientes que falten; retorna sus nombres. Es idempotente."""
+    created = []
+    with engine.begin() as conn:
+        for index in missing_indexes(conn):
+            logger.info("Creando índice %s", index.name)
+            index.create(conn)
+            created.append(index.name)
+    return created
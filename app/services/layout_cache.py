@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.models import Seat
+
+
+class SeatRecord(NamedTuple):
+    """Asiento inmutable y compacto con índices de fila, columna y sección precalculados."""
+    seat_id: int
+    seat_row: int
+    seat_column: str
+    seat_type_id: int
+    row_index: int
+    column_index: int
+    section_id: int
+
+
+def derive_sections(columns: Sequence[str]) -> List[List[str]]:
+    """Deduce las secciones a partir de las columnas existentes: una letra ausente es un pasillo."""
+    sections: List[List[str]] = []
+    for column in sorted(set(columns)):
+        if sections and ord(column) - ord(sections[-1][-1]) == 1:
+            sections[-1].append(column)
+        else:
+            sections.append([column])
+    return sections
+
+
+def load_declared_layouts(path: Optional[str]) -> Dict[int, List[List[str]]]:
+    """Lee un archivo JSON declarativo {"<airplane_id>": {"sections": [["A", "B"], ...]}}."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as layout_file:
+        declared = json.load(layout_file)
+    return {int(airplane_id): config["sections"] for airplane_id, config in declared.items()}
+
+
+# Secciones declaradas explícitamente; el resto se deduce de la tabla seat
+declared_layouts = load_declared_layouts(os.getenv("AIRPLANE_LAYOUTS_FILE"))
+
+
+class AirplaneLayout:
+    """Distribución compilada de un avión: asientos ordenados, secciones, adyacencias y vecinos."""
+
+    __slots__ = ('airplane_id', 'seats', 'by_id', 'by_place', 'sections', 'adjacent', 'column_index',
+                 'right', 'left', '_position', 'loaded_at')
+
+    def __init__(self, airplane_id: int, seats: Tuple[SeatRecord, ...], sections: Sequence[Sequence[str]]):
+        self.airplane_id = airplane_id
+        self.seats = seats
+        self.by_id: Dict[int, SeatRecord] = {seat.seat_id: seat for seat in seats}
+        # Asiento por (fila, índice de columna), para buscar alrededor de una posición
+        self.by_place: Dict[Tuple[int, int], SeatRecord] = {(seat.seat_row, seat.column_index): seat for seat in seats}
+        self.sections = tuple(tuple(section) for section in sections)
+        # Columnas pegadas dentro de una misma sección
+        self.adjacent = tuple(pair for section in self.sections for pair in zip(section, section[1:]))
+        self.column_index = {column: ord(column) - ord('A') for section in self.sections for column in section}
+        # Vecino derecho de cada asiento (posición en seats, -1 si no hay)
+        self._position = {seat.seat_id: i for i, seat in enumerate(seats)}
+        place = {(seat.seat_row, seat.seat_column): i for i, seat in enumerate(seats)}
+        next_column = dict(self.adjacent)
+        self.right = array('i', (
+            place.get((seat.seat_row, next_column.get(seat.seat_column)), -1) for seat in seats
+        ))
+        self.left = array('i', [-1] * len(seats))
+        for i, position in enumerate(self.right):
+            if position >= 0:
+                self.left[position] = i
+        self.loaded_at = time.monotonic()
+
+    def right_neighbor(self, seat: SeatRecord) -> Optional[SeatRecord]:
+        """Asiento pegado a la derecha en la misma fila y sección."""
+        position = self.right[self._position[seat.seat_id]]
+        return self.seats[position] if position >= 0 else None
+
+    def neighbors(self, seat: SeatRecord) -> List[SeatRecord]:
+        """Asientos pegados (izquierda y derecha) en la misma fila y sección."""
+        i = self._position[seat.seat_id]
+        return [self.seats[position] for position in (self.left[i], self.right[i]) if position >= 0]
+
+    @classmethod
+    def from_rows(cls, airplane_id: int, rows,
+                  sections: Optional[Sequence[Sequence[str]]] = None) -> 'AirplaneLayout':
+        """Construye la distribución a partir de filas (seat_id, seat_row, seat_column, seat_type_id)."""
+        rows = sorted(rows, key=lambda r: (r[1], r[2]))
+        if sections is None:
+            sections = declared_layouts.get(airplane_id) or derive_sections([r[2] for r in rows])
+        section_of = {column: i for i, section in enumerate(sections) for column in section}
+        row_numbers = {row: i for i, row in enumerate(sorted({r[1] for r in rows}))}
+        seats = tuple(
+            SeatRecord(seat_id, seat_row, seat_column, seat_type_id,
+                       row_numbers[seat_row], ord(seat_column) - ord('A'), section_of.get(seat_column, -1))
+            for seat_id, seat_row, seat_column, seat_type_id in rows
+        )
+        return cls(airplane_id, seats, sections)
+
+
+def layout_statement(airplane_id: int):
+    """Consulta liviana de los asientos de un avión (solo columnas necesarias)."""
+    return select(
+        Seat.seat_id, Seat.seat_row, Seat.seat_column, Seat.seat_type_id
+    ).where(Seat.airplane_id == airplane_id)
+
+
+def all_layouts_statement():
+    """Asientos de todos los aviones, agrupables por airplane_id."""
+    return select(
+        Seat.airplane_id, Seat.seat_id, Seat.seat_row, Seat.seat_column, Seat.seat_type_id
+    ).order_by(Seat.airplane_id)
+
+
+class SeatLayoutCache:
+    """Registro de distribuciones compiladas por avión, compartido por todo el proceso."""
+
+    def __init__(self, ttl: float = 3600.0):
+        self.ttl = ttl
+        self._layouts: Dict[int, AirplaneLayout] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, airplane_id: int) -> Optional[AirplaneLayout]:
+        """Retorna la distribución cacheada si existe y no ha expirado."""
+        layout = self._layouts.get(airplane_id)
+        if layout is not None and self.ttl > 0 and time.monotonic() - layout.loaded_at > self.ttl:
+            self.invalidate(airplane_id)
+            layout = None
+        if layout is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return layout
+
+    def put(self, layout: AirplaneLayout) -> AirplaneLayout:
+        with self._lock:
+            self._layouts[layout.airplane_id] = layout
+        return layout
+
+    def get_or_load(self, db: Session, airplane_id: int) -> AirplaneLayout:
+        """Obtiene la distribución desde cache o la carga desde la base de datos."""
+        layout = self.get(airplane_id)
+        if layout is None:
+            layout = self.put(AirplaneLayout.from_rows(airplane_id, db.execute(layout_statement(airplane_id)).all()))
+        return layout
+
+    async def get_or_load_async(self, db: AsyncSession, airplane_id: int) -> AirplaneLayout:
+        """Versión asíncrona de get_or_load."""
+        layout = self.get(airplane_id)
+        if layout is None:
+            result = await db.execute(layout_statement(airplane_id))
+            layout = self.put(AirplaneLayout.from_rows(airplane_id, result.all()))
+        return layout
+
+    def _put_all(self, rows) -> int:
+        loaded = 0
+        for airplane_id, seats in groupby(rows, key=itemgetter(0)):
+            self.put(AirplaneLayout.from_rows(airplane_id, [row[1:] for row in seats]))
+            loaded += 1
+        return loaded
+
+    def preload(self, db: Session) -> int:
+        """Carga las distribuciones de todos los aviones en una consulta; retorna cuántas cargó."""
+        return self._put_all(db.execute(all_layouts_statement()).all())
+
+    async def preload_async(self, db: AsyncSession) -> int:
+        """Versión asíncrona de preload."""
+        return self._put_all((await db.execute(all_layouts_statement())).all())
+
+    def invalidate(self, airplane_id: Optional[int] = None) -> None:
+        """Invalida un avión o todo el cache si no se indica airplane_id."""
+        with self._lock:
+            if airplane_id is None:
+                self._layouts.clear()
+            else:
+                self._layouts.pop(airplane_id, None)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._layouts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Cache compartido por todas las peticiones del proceso
+seat_layout_cache = SeatLayoutCache(ttl=float(os.getenv("SEAT_LAYOUT_CACHE_TTL", "3600")))
\ No newline at end of file
@@ -0,0 +1,26 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.models import Flight
+from app.services.layout_cache import AirplaneLayout, seat_layout_cache
+from app.services.records import BoardingPassRecord, boarding_pass_rows_statement
+
+
+def load_flight(db: Session, flight_id: int,
+                airplane_id: Optional[int] = None) -> Tuple[List[BoardingPassRecord], Optional[AirplaneLayout]]:
+    """Carga los boarding passes de un vuelo (por columnas, convertidos de una vez a registros) y su distribución.
+
+    Es la única parte de la asignación que accede a la BD; sin boarding passes no se carga la distribución.
+    """
+    boarding_passes = [
+        BoardingPassRecord.from_row(row)
+        for row in db.execute(boarding_pass_rows_statement(flight_id))
+    ]
+    if not boarding_passes:
+        return [], None
+    # El vuelo se consulta una sola vez, y solo si quien llama no conoce el avión
+    if airplane_id is None:
+        airplane_id = db.execute(
+            select(Flight.airplane_id).where(Flight.flight_id == flight_id)
+        ).scalar_one()
+    return boarding_passes, seat_layout_cache.get_or_load(db, airplane_id)
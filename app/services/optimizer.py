@@ -0,0 +1,170 @@
+import os
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Set
+from app.services.layout_cache import AirplaneLayout, SeatRecord
+from app.services.records import BoardingPassRecord
+
+# Presupuesto (ms) del optimizador tras las fases; 0 lo desactiva
+OPTIMIZER_BUDGET_MS = float(os.getenv("OPTIMIZER_BUDGET_MS", "0"))
+
+# Costo de un menor sin un adulto de su compra al lado: domina cualquier mejora de cercanía
+MINOR_PENALTY = 100.0
+
+# Peso de la diferencia de columnas (el mismo criterio de distancia que las fases)
+COLUMN_WEIGHT = 0.5
+
+# Alcance de los asientos candidatos alrededor de cada integrante del grupo
+CANDIDATE_ROWS = (0, -1, 1)
+CANDIDATE_COLUMNS = (-1, 1, -2, 2, -3, 3, 0)
+
+# Boarding passes indexados entre revisiones del plazo durante la preparación
+PREPARE_CHECK_EVERY = 512
+
+
+def seat_distance(a: SeatRecord, b: SeatRecord) -> float:
+    return abs(a.seat_row - b.seat_row) + abs(a.column_index - b.column_index) * COLUMN_WEIGHT
+
+
+class CohesionOptimizer:
+    """Búsqueda local acotada en tiempo sobre una asignación completa.
+
+    El objetivo es la cohesión de los grupos de compra: para cada integrante, la distancia al
+    integrante más cercano de su grupo, más una penalización por cada menor sin un adulto de su
+    compra al lado. Los movimientos (mover a un asiento libre o intercambiar con un pasajero de
+    otro grupo) respetan el tipo de asiento y no tocan los asientos fijos. Solo se aceptan
+    movimientos que bajan el costo total, así que el resultado nunca es peor que el de entrada.
+    """
+
+    def __init__(self, layout: AirplaneLayout, boarding_passes: List[BoardingPassRecord], fixed: Set[int]):
+        self.layout = layout
+        self.boarding_passes = boarding_passes
+        self.fixed = fixed
+        # Estado de la búsqueda; se arma en _prepare() dentro del plazo
+        self.occupant: Dict[int, BoardingPassRecord] = {}
+        self.groups: Dict[int, List[BoardingPassRecord]] = {}
+        self.movable: Set[int] = set()
+        self.costs: Dict[int, float] = {}
+        self._prepared = False
+
+    def _prepare(self, deadline: float, clock) -> bool:
+        """Índices y costo inicial de cada grupo; retorna False si se cumple el plazo antes de terminar."""
+        if self._prepared:
+            return True
+        groups: Dict[int, List[BoardingPassRecord]] = defaultdict(list)
+        for i, bp in enumerate(self.boarding_passes):
+            if i % PREPARE_CHECK_EVERY == 0 and clock() > deadline:
+                return False
+            groups[bp.purchase_id].append(bp)
+            if bp.seat_id:
+                self.occupant[bp.seat_id] = bp
+                if bp.boarding_pass_id not in self.fixed:
+                    self.movable.add(bp.boarding_pass_id)
+        self.groups = {purchase_id: group for purchase_id, group in groups.items() if len(group) > 1}
+        for purchase_id, group in self.groups.items():
+            if clock() > deadline:
+                return False
+            self.costs[purchase_id] = self.group_cost(group)
+        self._prepared = True
+        return True
+
+    def total_cost(self) -> float:
+        self._prepare(float("inf"), time.perf_counter)
+        return sum(self.costs.values())
+
+    def group_cost(self, group: List[BoardingPassRecord]) -> float:
+        by_id = self.layout.by_id
+        seated = [(bp, by_id[bp.seat_id]) for bp in group if bp.seat_id in by_id]
+        cost = 0.0
+        for bp, seat in seated:
+            cost += min((seat_distance(seat, other) for mate, other in seated if mate is not bp), default=0.0)
+            if bp.passenger.age < 18 and not any(
+                    self.occupant.get(neighbor.seat_id) in group
+                    and self.occupant[neighbor.seat_id].passenger.age >= 18
+                    for neighbor in self.layout.neighbors(seat)):
+                cost += MINOR_PENALTY
+        return cost
+
+    def _ideal(self, group: List[BoardingPassRecord]) -> float:
+        # Todos con un compañero pegado y sin menores solos: no se puede mejorar
+        return len(group) * COLUMN_WEIGHT
+
+    def _candidates(self, bp: BoardingPassRecord, group: List[BoardingPassRecord]) -> Iterator[SeatRecord]:
+        """Asientos del mismo tipo alrededor de los demás integrantes, los más cercanos primero."""
+        by_id = self.layout.by_id
+        seen = {bp.seat_id}
+        for mate in group:
+            if mate is bp or mate.seat_id not in by_id:
+                continue
+            anchor = by_id[mate.seat_id]
+            for row_offset in CANDIDATE_ROWS:
+                for column_offset in CANDIDATE_COLUMNS:
+                    seat = self.layout.by_place.get((anchor.seat_row + row_offset, anchor.column_index + column_offset))
+                    if seat is not None and seat.seat_id not in seen and seat.seat_type_id == bp.seat_type_id:
+                        seen.add(seat.seat_id)
+                        yield seat
+
+    def _try_move(self, bp: BoardingPassRecord, target: SeatRecord) -> bool:
+        """Mueve (o intercambia) si baja el costo total; si no, deshace el cambio."""
+        other = self.occupant.get(target.seat_id)
+        if other is not None and (other.boarding_pass_id not in self.movable or other.purchase_id == bp.purchase_id):
+            return False
+        source = bp.seat_id
+        affected = {bp.purchase_id}
+        if other is not None:
+            affected.add(other.purchase_id)
+        affected = [purchase_id for purchase_id in affected if purchase_id in self.groups]
+        before = sum(self.costs[purchase_id] for purchase_id in affected)
+
+        self._place(bp, target.seat_id, other, source)
+        after = {purchase_id: self.group_cost(self.groups[purchase_id]) for purchase_id in affected}
+        if sum(after.values()) < before - 1e-9:
+            self.costs.update(after)
+            return True
+        # Deshacer
+        self._place(bp, source, other, target.seat_id)
+        return False
+
+    def _place(self, bp: BoardingPassRecord, seat_id: int, other, other_seat_id: int) -> None:
+        del self.occupant[bp.seat_id]
+        if other is not None:
+            other.seat_id = other_seat_id
+            self.occupant[other_seat_id] = other
+        bp.seat_id = seat_id
+        self.occupant[seat_id] = bp
+
+    def _improve_group(self, group: List[BoardingPassRecord], deadline: float, clock) -> bool:
+        by_id = self.layout.by_id
+        members = [bp for bp in group if bp.boarding_pass_id in self.movable]
+
+        def distance_to_group(bp):
+            seat = by_id[bp.seat_id]
+            return min((seat_distance(seat, by_id[mate.seat_id]) for mate in group
+                        if mate is not bp and mate.seat_id in by_id), default=0.0)
+
+        # Primero los integrantes más alejados del resto del grupo
+        for bp in sorted(members, key=distance_to_group, reverse=True):
+            for target in self._candidates(bp, group):
+                if clock() > deadline:
+                    return False
+                if self._try_move(bp, target):
+                    return True
+        return False
+
+    def run(self, deadline: float) -> None:
+        """Mejora hasta que no haya movimientos que bajen el costo o se cumpla el plazo (perf_counter)."""
+        clock = time.perf_counter
+        # La preparación (índices y costos iniciales) también consume el presupuesto
+        if not self._prepare(deadline, clock):
+            return
+        improved = True
+        while improved and clock() < deadline:
+            improved = False
+            for purchase_id in sorted(self.costs, key=self.costs.get, reverse=True):
+                group = self.groups[purchase_id]
+                if self.costs[purchase_id] <= self._ideal(group) + 1e-9:
+                    continue
+                if clock() > deadline:
+                    return
+                while self._improve_group(group, deadline, clock):
+                    improved = True
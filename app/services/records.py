@@ -0,0 +1,89 @@
+from typing import NamedTuple, Optional
+from sqlalchemy import select
+from app.models.models import BoardingPass, Flight, Passenger
+
+
+class FlightRecord(NamedTuple):
+    """Vuelo liviano (sin ORM) con los campos de la respuesta."""
+    flight_id: int
+    takeoff_date_time: int
+    takeoff_airport: str
+    landing_date_time: int
+    landing_airport: str
+    airplane_id: int
+
+
+class PriorAssignment(NamedTuple):
+    """Asignación previa de un boarding pass (desde un resultado cacheado o persistido)."""
+    purchase_id: int
+    seat_type_id: int
+    seat_id: Optional[int]
+
+
+class PassengerRecord:
+    """Pasajero liviano (sin ORM), con la misma forma que el modelo Passenger."""
+
+    __slots__ = ('passenger_id', 'dni', 'name', 'age', 'country')
+
+    def __init__(self, passenger_id: Optional[int] = None, dni: Optional[int] = None,
+                 name: Optional[str] = None, age: Optional[int] = None, country: Optional[str] = None):
+        self.passenger_id = passenger_id
+        self.dni = dni
+        self.name = name
+        self.age = age
+        self.country = country
+
+
+class BoardingPassRecord:
+    """Boarding pass liviano (sin ORM), con la misma forma que el modelo BoardingPass."""
+
+    __slots__ = ('boarding_pass_id', 'purchase_id', 'seat_type_id', 'seat_id', 'flight_id', 'passenger')
+
+    def __init__(self, boarding_pass_id: int, purchase_id: int, seat_type_id: int,
+                 seat_id: Optional[int], flight_id: Optional[int], passenger: PassengerRecord):
+        self.boarding_pass_id = boarding_pass_id
+        self.purchase_id = purchase_id
+        self.seat_type_id = seat_type_id
+        self.seat_id = seat_id
+        self.flight_id = flight_id
+        self.passenger = passenger
+
+    @classmethod
+    def from_row(cls, row) -> 'BoardingPassRecord':
+        """Construye el registro desde una fila de boarding_pass_rows_statement."""
+        (boarding_pass_id, purchase_id, seat_type_id, seat_id, flight_id,
+         passenger_id, dni, name, age, country) = row
+        return cls(boarding_pass_id, purchase_id, seat_type_id, seat_id, flight_id,
+                   PassengerRecord(passenger_id, dni, name, age, country))
+
+    def assignment_row(self) -> tuple:
+        """Campos mínimos que necesita el motor de asignación (para enviar a otros procesos)."""
+        return (self.boarding_pass_id, self.purchase_id, self.seat_type_id, self.seat_id, self.passenger.age)
+
+    @classmethod
+    def from_assignment_row(cls, row) -> 'BoardingPassRecord':
+        boarding_pass_id, purchase_id, seat_type_id, seat_id, age = row
+        return cls(boarding_pass_id, purchase_id, seat_type_id, seat_id, None, PassengerRecord(age=age))
+
+
+def flight_rows_statement():
+    """Consulta por columnas de vuelos, en el orden de FlightRecord."""
+    return select(
+        Flight.flight_id, Flight.takeoff_date_time, Flight.takeoff_airport,
+        Flight.landing_date_time, Flight.landing_airport, Flight.airplane_id,
+    )
+
+
+def boarding_pass_rows_statement(*flight_ids: int):
+    """Consulta por columnas (sin entidades ORM) de boarding passes y sus pasajeros.
+
+    Sin flight_ids retorna los boarding passes de todos los vuelos.
+    """
+    statement = select(
+        BoardingPass.boarding_pass_id, BoardingPass.purchase_id, BoardingPass.seat_type_id,
+        BoardingPass.seat_id, BoardingPass.flight_id,
+        Passenger.passenger_id, Passenger.dni, Passenger.name, Passenger.age, Passenger.country,
+    ).join(Passenger, Passenger.passenger_id == BoardingPass.passenger_id)
+    if flight_ids:
+        statement = statement.where(BoardingPass.flight_id.in_(flight_ids))
+    return statement.order_by(BoardingPass.flight_id, BoardingPass.boarding_pass_id)
\ No newline at end of file
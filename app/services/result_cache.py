@@ -0,0 +1,153 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from sqlalchemy import func, select
+from app.models.models import BoardingPass, Flight, Passenger
+
+
+def _fingerprint_columns() -> tuple:
+    """Agregados de los boarding passes del vuelo y de los pasajeros que aparecen en la respuesta."""
+    return (
+        func.count(BoardingPass.boarding_pass_id),
+        func.max(BoardingPass.boarding_pass_id),
+        func.sum(BoardingPass.boarding_pass_id * (func.coalesce(BoardingPass.seat_id, 0) + 1)),
+        func.sum(BoardingPass.boarding_pass_id * BoardingPass.seat_type_id + BoardingPass.purchase_id),
+        func.sum(BoardingPass.passenger_id),
+        # Pasajero: la edad cambia la ubicación de los menores; dni, nombre y país van en la respuesta
+        func.sum(BoardingPass.boarding_pass_id * (func.coalesce(Passenger.age, -1) + 2)),
+        func.sum(func.coalesce(Passenger.dni, 0)),
+        func.sum(BoardingPass.boarding_pass_id * (
+            func.length(func.coalesce(Passenger.name, "")) * 257
+            + func.length(func.coalesce(Passenger.country, "")) + 1
+        )),
+    )
+
+
+def fingerprint_statement(flight_id: int):
+    """Consulta agregada y barata que cambia cuando cambia cualquier boarding pass del vuelo o su pasajero."""
+    return select(*_fingerprint_columns()).select_from(BoardingPass).outerjoin(
+        Passenger, Passenger.passenger_id == BoardingPass.passenger_id
+    ).where(BoardingPass.flight_id == flight_id)
+
+
+def flight_version_statement(flight_id: int):
+    """Vuelo (columnas de FlightRecord) y el agregado de fingerprint_statement en una sola consulta."""
+    return select(
+        Flight.flight_id, Flight.takeoff_date_time, Flight.takeoff_airport,
+        Flight.landing_date_time, Flight.landing_airport, Flight.airplane_id,
+        *_fingerprint_columns(),
+    ).outerjoin(BoardingPass, BoardingPass.flight_id == Flight.flight_id).outerjoin(
+        Passenger, Passenger.passenger_id == BoardingPass.passenger_id
+    ).where(
+        Flight.flight_id == flight_id
+    ).group_by(
+        Flight.flight_id, Flight.takeoff_date_time, Flight.takeoff_airport,
+        Flight.landing_date_time, Flight.landing_airport, Flight.airplane_id,
+    )
+
+
+def flight_fingerprint(flight: Flight, aggregates: Tuple) -> Tuple:
+    """Clave de versión del vuelo: datos del vuelo más el agregado de sus boarding passes."""
+    aggregates = tuple(int(value or 0) for value in aggregates)
+    return (
+        flight.flight_id, flight.airplane_id, flight.takeoff_date_time, flight.takeoff_airport,
+        flight.landing_date_time, flight.landing_airport,
+    ) + aggregates
+
+
+# Cambiar al modificar el algoritmo de asignación o el formato de la respuesta
+ETAG_VERSION = "1"
+
+
+def flight_etag(fingerprint: Hashable, variant: str, *extra: Hashable, weak: bool = True) -> str:
+    """ETag de una versión del vuelo en una representación (json / ndjson).
+
+    Es débil por defecto: la huella es un agregado y no un hash del contenido (por ejemplo, un
+    cambio de nombre con el mismo largo no la altera). Solo una clave que cubre todo el contenido
+    debe usar weak=False.
+    """
+    key = repr((ETAG_VERSION, variant, fingerprint) + extra).encode("utf-8")
+    tag = '"' + hashlib.blake2b(key, digest_size=16).hexdigest() + '"'
+    return "W/" + tag if weak else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de If-None-Match (lista de ETags, prefijo W/ o \"*\")."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    etag = etag.removeprefix("W/")
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class SimulationCache:
+    """Cache LRU con TTL para resultados de simulación de check-in, versionado por huella."""
+
+    def __init__(self, max_size: int = 256, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # flight_id -> (huella, instante de carga, resultado)
+        self._entries: 'OrderedDict[int, Tuple[Hashable, float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, flight_id: int, fingerprint: Hashable) -> Optional[Any]:
+        """Retorna el resultado cacheado si la huella coincide y no expiró."""
+        with self._lock:
+            entry = self._entries.get(flight_id)
+            if entry is not None and self.ttl > 0 and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[flight_id]
+                entry = None
+            # Una versión antigua se conserva como base para la asignación incremental
+            if entry is None or entry[0] != fingerprint:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(flight_id)
+            self.hits += 1
+            return entry[2]
+
+    def latest(self, flight_id: int) -> Optional[Any]:
+        """Último resultado guardado del vuelo, aunque su huella ya no coincida (sin contar acierto)."""
+        with self._lock:
+            entry = self._entries.get(flight_id)
+            if entry is None or (self.ttl > 0 and time.monotonic() - entry[1] > self.ttl):
+                return None
+            return entry[2]
+
+    def put(self, flight_id: int, fingerprint: Hashable, value: Any) -> None:
+        """Guarda un resultado; reemplaza cualquier versión anterior del vuelo."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[flight_id] = (fingerprint, time.monotonic(), value)
+            self._entries.move_to_end(flight_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, flight_id: Optional[int] = None) -> None:
+        """Invalida un vuelo o todo el cache si no se indica flight_id."""
+        with self._lock:
+            if flight_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(flight_id, None)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Cache compartido de resultados de simulación
+simulation_cache = SimulationCache(
+    max_size=int(os.getenv("SIMULATION_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("SIMULATION_CACHE_TTL", "60")),
+)
\ No newline at end of file
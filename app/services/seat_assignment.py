@@ -1,49 +1,142 @@
-from typing import List, Dict, Tuple, Optional
-from sqlalchemy.orm import Session, joinedload
-from app.models.models import BoardingPass, Seat
+import time
+from typing import List, Dict, Mapping, Tuple, Optional, Set
 from collections import defaultdict
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy está en requirements.txt; esto es solo un resguardo
+    np = None
+from app.services.seat_index import SeatIndex
+from app.services.layout_cache import AirplaneLayout, SeatRecord
+from app.services.records import BoardingPassRecord, PriorAssignment
+from app.services.optimizer import OPTIMIZER_BUDGET_MS, CohesionOptimizer
+
+# Peso de la diferencia de columnas en la distancia entre asientos (prioriza misma fila)
+COLUMN_DISTANCE_WEIGHT = 0.5
 
 class SeatAssignmentService:
-    def __init__(self, db: Session):
-        self.db = db
-        # Configuración de aviones
-        self.airplane_configs = {
-            1: {'sections': [['A', 'B', 'C'], ['E', 'F', 'G']], 'adjacent': [('A','B'), ('B','C'), ('E','F'), ('F','G')]},
-            2: {'sections': [['A', 'B'], ['D', 'E', 'F'], ['H', 'I']], 'adjacent': [('A','B'), ('D','E'), ('E','F'), ('H','I')]}
-        }
+    """Motor de asignación sobre registros livianos y distribuciones compiladas, sin BD ni ORM.
+
+    La carga de datos está en app.services.loader; el motor se puede usar en procesos worker
+    y en pruebas con registros construidos a mano.
+    """
+
+    def __init__(self, optimize_ms: Optional[float] = None):
+        # Duración (segundos) de cada fase de la última asignación
+        self.timings: Dict[str, float] = {}
+        # Presupuesto del optimizador de cohesión tras las fases (0 = solo las fases)
+        self.optimize_ms = OPTIMIZER_BUDGET_MS if optimize_ms is None else optimize_ms
+        # Secciones, adyacencias y vecinos de cada avión vienen compilados en su AirplaneLayout
     
 
-    def assign_seats_for_flight(self, flight_id: int) -> List[BoardingPass]:        
-        boarding_passes = self.db.query(BoardingPass).filter(
-            BoardingPass.flight_id == flight_id
-        ).options(joinedload(BoardingPass.passenger), joinedload(BoardingPass.flight)).all()
-        
+    def assign(self, boarding_passes: List[BoardingPassRecord], layout: AirplaneLayout,
+               prior: Optional[Mapping[int, PriorAssignment]] = None) -> Dict[int, Optional[int]]:
+        """Asigna asientos y retorna boarding_pass_id -> seat_id (incremental si se indica `prior`)."""
+        if prior is None:
+            self.assign_seats(boarding_passes, layout)
+        else:
+            self.assign_incremental(boarding_passes, layout, prior)
+        return {bp.boarding_pass_id: bp.seat_id for bp in boarding_passes}
+
+
+    def assign_seats(self, boarding_passes: List[BoardingPassRecord], layout: AirplaneLayout) -> List[BoardingPassRecord]:
+        """Ejecuta las fases de asignación sobre datos ya cargados, sin acceder a la BD."""
         if not boarding_passes:
             return []
+        # Vuelo ya asignado (p. ej. con asignaciones persistidas): no hay trabajo que hacer
+        if all(bp.seat_id for bp in boarding_passes):
+            self.timings = {}
+            return boarding_passes
         
-        airplane_id = boarding_passes[0].flight.airplane_id
-        available_seats = self._get_available_seats(airplane_id, flight_id)
+        self.layout = layout
+        started = time.perf_counter()
+        # Los asientos ocupados del vuelo salen de los boarding passes ya cargados
+        occupied = {bp.seat_id for bp in boarding_passes if bp.seat_id}
+        available_seats = self._index_free_seats(occupied)
         purchase_groups = self._group_by_purchase(boarding_passes)
+        self.timings = {'index': time.perf_counter() - started}
+        fixed = {bp.boarding_pass_id for bp in boarding_passes if bp.seat_id}
+        self._run_phases(purchase_groups, available_seats)
+        self._optimize(boarding_passes, fixed)
+        return boarding_passes
 
-        # Pre-cargar todos los asientos para evitar consultas individuales
-        self.all_seats_cache = self._load_all_seats_cache(airplane_id)
-        
-        print ("Asignando asientos para grupos con menores de edad")
-        self._assign_groups_with_minors(purchase_groups, available_seats, airplane_id)
 
-        print ("Asignando asientos para grupos con asientos preasignados")
+    def assign_incremental(self, boarding_passes: List[BoardingPassRecord], layout: AirplaneLayout,
+                           prior: Mapping[int, PriorAssignment]) -> List[BoardingPassRecord]:
+        """Parte de una asignación anterior del vuelo y solo ubica los boarding passes nuevos o modificados.
+
+        Un boarding pass conserva su asiento anterior si mantiene compra y tipo de asiento y el
+        asiento sigue libre. El resto pasa por las mismas fases, pero solo sobre las compras
+        afectadas y contra la ocupación existente.
+        """
+        if not boarding_passes:
+            return []
+        occupied = {bp.seat_id for bp in boarding_passes if bp.seat_id}
+        for bp in boarding_passes:
+            previous = prior.get(bp.boarding_pass_id)
+            if bp.seat_id or previous is None or not previous.seat_id or previous.seat_id in occupied:
+                continue
+            seat = layout.by_id.get(previous.seat_id)
+            if (seat is not None and seat.seat_type_id == bp.seat_type_id
+                    and previous.purchase_id == bp.purchase_id and previous.seat_type_id == bp.seat_type_id):
+                bp.seat_id = previous.seat_id
+                occupied.add(previous.seat_id)
+
+        affected = {bp.purchase_id for bp in boarding_passes if not bp.seat_id}
+        if not affected:
+            self.timings = {}
+            return boarding_passes
+
+        self.layout = layout
+        started = time.perf_counter()
+        # Los asientos conservados quedan fijos: el optimizador solo mueve lo recién ubicado
+        fixed = {bp.boarding_pass_id for bp in boarding_passes if bp.seat_id}
+        available_seats = self._index_free_seats(occupied)
+        purchase_groups = self._group_by_purchase([bp for bp in boarding_passes if bp.purchase_id in affected])
+        self.timings = {'index': time.perf_counter() - started}
+        # Menores nuevos de compras con adultos ya sentados: junto a uno de ellos si hay lugar
+        self._seat_minors_next_to_adults(purchase_groups, available_seats)
+        self._run_phases(purchase_groups, available_seats)
+        self._optimize(boarding_passes, fixed)
+        return boarding_passes
+
+
+    def _run_phases(self, purchase_groups: Dict[int, List[BoardingPassRecord]],
+                    available_seats: Dict[int, SeatIndex]) -> None:
+        """Ejecuta las cuatro fases en orden de prioridad, registrando su duración en self.timings."""
+        clock = time.perf_counter
+        timings = self.timings
+
+        # Fase 1: grupos con menores de edad
+        started = clock()
+        self._assign_groups_with_minors(purchase_groups, available_seats)
+        timings['minors'] = clock() - started
+
+        # Fase 2: grupos con asientos preasignados
+        started = clock()
         self._assign_groups_with_pre_assigned(purchase_groups, available_seats)
+        timings['pre_assigned'] = clock() - started
 
-        print ("Asignando asientos por grupos")
-        self._assign_remaining_groups(purchase_groups, available_seats, airplane_id)
+        # Fase 3: resto de los grupos
+        started = clock()
+        self._assign_remaining_groups(purchase_groups, available_seats)
+        timings['groups'] = clock() - started
 
-        print ("Asignando asientos para el resto de los pasajeros")
+        # Fase 4: pasajeros individuales
+        started = clock()
         self._assign_individuals(purchase_groups, available_seats)
-        
-        return boarding_passes
+        timings['individuals'] = clock() - started
+
+
+    def _optimize(self, boarding_passes: List[BoardingPassRecord], fixed: Set[int]) -> None:
+        """Mejora la cohesión de los grupos por búsqueda local, dentro de self.optimize_ms."""
+        if self.optimize_ms <= 0:
+            return
+        started = time.perf_counter()
+        CohesionOptimizer(self.layout, boarding_passes, fixed).run(started + self.optimize_ms / 1000)
+        self.timings['optimize'] = time.perf_counter() - started
     
 
-    def _group_by_purchase(self, boarding_passes: List[BoardingPass]) -> Dict[int, List[BoardingPass]]:
+    def _group_by_purchase(self, boarding_passes: List[BoardingPassRecord]) -> Dict[int, List[BoardingPassRecord]]:
         """Agrupa por purchase_id."""
         groups = defaultdict(list)
         for bp in boarding_passes:
@@ -51,75 +144,51 @@ class SeatAssignmentService:
         return dict(groups)
     
 
-    def _get_available_seats(self, airplane_id: int, flight_id: int) -> Dict[int, List[Seat]]:
-        """Obtiene asientos disponibles por tipo."""
-        # Consulta única con LEFT JOIN para obtener asientos disponibles
-        available_seats = self.db.query(Seat).outerjoin(
-            BoardingPass, 
-            (BoardingPass.seat_id == Seat.seat_id) & (BoardingPass.flight_id == flight_id)
-        ).filter(
-            Seat.airplane_id == airplane_id,
-            BoardingPass.seat_id.is_(None)
-        ).order_by(Seat.seat_row, Seat.seat_column).all()
-        
+    def _index_free_seats(self, occupied: Set[int]) -> Dict[int, SeatIndex]:
+        """Construye el índice de asientos libres por tipo a partir de la distribución cargada."""
         seats_by_type = defaultdict(list)
-        for seat in available_seats:
-            seats_by_type[seat.seat_type_id].append(seat)
+        for seat in self.layout.seats:
+            if seat.seat_id not in occupied:
+                seats_by_type[seat.seat_type_id].append(seat)
         
-        return dict(seats_by_type)
+        # Índice de ocupación por tipo, construido una sola vez
+        return {seat_type_id: SeatIndex(seats, self.layout)
+                for seat_type_id, seats in seats_by_type.items()}
 
     ### FUNCIONES AUXILIARES ###
-    def _assign_minor_adult_pairs(self, minors: List[BoardingPass], adults: List[BoardingPass],
-                                 seat_type_id: int, available_seats: Dict[int, List[Seat]], airplane_id: int) -> None:
+    def _assign_minor_adult_pairs(self, minors: List[BoardingPassRecord], adults: List[BoardingPassRecord],
+                                 seat_type_id: int, available_seats: Dict[int, SeatIndex]) -> None:
         """Asigna pares adulto-menor adyacentes."""
         if seat_type_id not in available_seats:
             return
         # Asignar pares adyacentes
         for i in range(min(len(minors), len(adults))):
-            pair = self._find_adjacent_pair(seat_type_id, available_seats, airplane_id)
+            pair = self._find_adjacent_pair(seat_type_id, available_seats)
             if pair:
                 adults[i].seat_id = pair[0].seat_id
                 minors[i].seat_id = pair[1].seat_id
-                available_seats[seat_type_id].remove(pair[0])
-                available_seats[seat_type_id].remove(pair[1])
+                available_seats[seat_type_id].take(pair[0])
+                available_seats[seat_type_id].take(pair[1])
         # Asignar restantes
         for bp in minors + adults:
             if not bp.seat_id:
                 seat = self._get_next_seat(seat_type_id, available_seats)
                 if seat:
                     bp.seat_id = seat.seat_id
-                    available_seats[seat_type_id].remove(seat)
+                    available_seats[seat_type_id].take(seat)
 
     
-    def _find_adjacent_pair(self, seat_type_id: int, available_seats: Dict[int, List[Seat]], 
-                           airplane_id: int) -> Optional[Tuple[Seat, Seat]]:
+    def _find_adjacent_pair(self, seat_type_id: int,
+                           available_seats: Dict[int, SeatIndex]) -> Optional[Tuple[SeatRecord, SeatRecord]]:
         """Encuentra par de asientos adyacentes."""
         if seat_type_id not in available_seats:
             return None
-        
-        seats = available_seats[seat_type_id]
-        config = self.airplane_configs.get(airplane_id, self.airplane_configs[1])
-        adjacent_set = set(config['adjacent'])  # Convertir a set para búsqueda O(1)
-        
-        # Agrupar por fila para búsqueda más eficiente
-        by_row = defaultdict(list)
-        for seat in seats:
-            by_row[seat.seat_row].append(seat)
-        
-        # Buscar en cada fila
-        for row_seats in by_row.values():
-            if len(row_seats) < 2:
-                continue
-            for i, seat1 in enumerate(row_seats):
-                for seat2 in row_seats[i+1:]:
-                    if ((seat1.seat_column, seat2.seat_column) in adjacent_set or
-                        (seat2.seat_column, seat1.seat_column) in adjacent_set):
-                        return (seat1, seat2)
-        return None
+        # Consulta en tiempo constante sobre el índice de pares adyacentes libres
+        return available_seats[seat_type_id].find_pair()
 
 
-    def _assign_near_existing_seats(self, unassigned: List[BoardingPass], 
-                                  assigned: List[BoardingPass], available_seats: Dict[int, List[Seat]]) -> None:
+    def _assign_near_existing_seats(self, unassigned: List[BoardingPassRecord], 
+                                  assigned: List[BoardingPassRecord], available_seats: Dict[int, SeatIndex]) -> None:
         """Asigna pasajeros cerca de otros miembros del grupo que ya tienen asiento."""
         # Pre-cargar asientos asignados para evitar consultas repetidas
         assigned_seats = []
@@ -130,116 +199,127 @@ class SeatAssignmentService:
                     assigned_seats.append(seat)
         if not assigned_seats:
             return
+        # Anclas del grupo como arreglos, para calcular todas las distancias de una vez
+        anchors = None
+        if np is not None:
+            anchors = (np.array([seat.seat_row for seat in assigned_seats], dtype=np.float64),
+                       np.array([seat.column_index for seat in assigned_seats], dtype=np.float64))
         for bp in unassigned:
             if bp.seat_type_id not in available_seats:
                 continue
-            best_seat = None
-            min_distance = float('inf')
             # Buscar el mejor asiento disponible
-            for available_seat in available_seats[bp.seat_type_id]:
-                # Calcular distancia mínima a cualquier asiento asignado
-                min_dist_to_group = min(
-                    self._calculate_seat_distance(available_seat, assigned_seat)
-                    for assigned_seat in assigned_seats
-                )
-                if min_dist_to_group < min_distance:
-                    min_distance = min_dist_to_group
-                    best_seat = available_seat
+            best_seat = self._find_nearest_seat(available_seats[bp.seat_type_id], assigned_seats, anchors)
             # Asignar el mejor asiento encontrado
             if best_seat:
                 bp.seat_id = best_seat.seat_id
-                available_seats[best_seat.seat_type_id].remove(best_seat)
+                available_seats[best_seat.seat_type_id].take(best_seat)
+
+
+    def _find_nearest_seat(self, index: SeatIndex, assigned_seats: List[SeatRecord],
+                           anchors: Optional[Tuple] = None) -> Optional[SeatRecord]:
+        """Asiento libre con menor distancia al grupo; ante empate, el primero en orden de fila y columna."""
+        if anchors is not None and index:
+            # Versión vectorizada: matriz asientos x anclas en una sola pasada
+            rows, columns, free = index.arrays()
+            anchor_rows, anchor_columns = anchors
+            distances = (np.abs(rows[:, None] - anchor_rows[None, :])
+                         + np.abs(columns[:, None] - anchor_columns[None, :]) * COLUMN_DISTANCE_WEIGHT).min(axis=1)
+            distances[free == 0] = np.inf
+            return index.seats[int(np.argmin(distances))]
+
+        best_seat = None
+        min_distance = float('inf')
+        for available_seat in index.iter_free():
+            # Calcular distancia mínima a cualquier asiento asignado
+            min_dist_to_group = min(
+                self._calculate_seat_distance(available_seat, assigned_seat)
+                for assigned_seat in assigned_seats
+            )
+            if min_dist_to_group < min_distance:
+                min_distance = min_dist_to_group
+                best_seat = available_seat
+        return best_seat
 
 
     def _find_consecutive_seats(self, count: int, seat_type_id: int, 
-                              available_seats: Dict[int, List[Seat]], airplane_id: int) -> List[Seat]:
+                              available_seats: Dict[int, SeatIndex]) -> List[SeatRecord]:
         """Encuentra asientos consecutivos."""
         if seat_type_id not in available_seats or len(available_seats[seat_type_id]) < count:
             return []
         
-        seats = available_seats[seat_type_id]
-        config = self.airplane_configs.get(airplane_id, self.airplane_configs[1])
-        
-        # Pre-convertir secciones a sets para búsqueda O(1)
-        section_sets = [set(section) for section in config['sections']]
-        
-        # Agrupar por fila y pre-ordenar
-        by_row = defaultdict(list)
-        for seat in seats:
-            by_row[seat.seat_row].append(seat)
-        
-        # Buscar consecutivos en cada fila
-        for row_seats in by_row.values():
-            if len(row_seats) < count:
-                continue
-            
-            # Ordenar una sola vez por fila
-            row_seats.sort(key=lambda s: self._get_column_index(s.seat_column))
-            
-            # Buscar secuencia en cada sección
-            for section_set in section_sets:
-                section_seats = [s for s in row_seats if s.seat_column in section_set]
-                if len(section_seats) >= count:
-                    return section_seats[:count]
-        
-        return []
+        index = available_seats[seat_type_id]
+        # Bloque realmente contiguo en una sección, con mejor ajuste, desde el índice de tramos libres
+        block = index.find_block(count)
+        if block is None:
+            # Grupos más grandes que cualquier tramo libre: tramos de una misma fila
+            block = index.find_row_block(count)
+        return block or []
 
 
-    def _assign_group_together(self, passengers: List[BoardingPass], seat_type_id: int, 
-                             available_seats: Dict[int, List[Seat]], airplane_id: int) -> None:
+    def _assign_group_together(self, passengers: List[BoardingPassRecord], seat_type_id: int, 
+                             available_seats: Dict[int, SeatIndex]) -> None:
         """Asigna grupo junto cuando es posible."""
         if seat_type_id not in available_seats:
             return
-        consecutive = self._find_consecutive_seats(len(passengers), seat_type_id, available_seats, airplane_id)
+        consecutive = self._find_consecutive_seats(len(passengers), seat_type_id, available_seats)
         if consecutive:
             for i, bp in enumerate(passengers):
                 if i < len(consecutive):
                     bp.seat_id = consecutive[i].seat_id
-                    available_seats[seat_type_id].remove(consecutive[i])
+                    available_seats[seat_type_id].take(consecutive[i])
         else:
             # Asignar individualmente
             for bp in passengers:
                 seat = self._get_next_seat(seat_type_id, available_seats)
                 if seat:
                     bp.seat_id = seat.seat_id
-                    available_seats[seat_type_id].remove(seat)
+                    available_seats[seat_type_id].take(seat)
 
 
-    def _get_column_index(self, column: str) -> int:
-        """Índice de columna."""
-        return ord(column) - ord('A')
-    
-
-    def _find_seat_by_id(self, seat_id: int) -> Optional[Seat]:
-        """Encuentra un asiento por su ID usando cache."""
-        return self.all_seats_cache.get(seat_id)
+    def _find_seat_by_id(self, seat_id: int) -> Optional[SeatRecord]:
+        """Encuentra un asiento por su ID usando la distribución cacheada."""
+        return self.layout.by_id.get(seat_id)
     
 
-    def _load_all_seats_cache(self, airplane_id: int) -> Dict[int, Seat]:
-        """Pre-carga todos los asientos del avión en un diccionario para acceso rápido."""
-        all_seats = self.db.query(Seat).filter(Seat.airplane_id == airplane_id).all()
-        return {seat.seat_id: seat for seat in all_seats}
-    
-
-    def _calculate_seat_distance(self, seat1: Seat, seat2: Seat) -> float:
+    def _calculate_seat_distance(self, seat1: SeatRecord, seat2: SeatRecord) -> float:
         """Calcula la distancia entre dos asientos."""
         row_diff = abs(seat1.seat_row - seat2.seat_row)
-        col_diff = abs(self._get_column_index(seat1.seat_column) - 
-                      self._get_column_index(seat2.seat_column))
-        return row_diff + col_diff * 0.5  # Priorizar misma fila
+        col_diff = abs(seat1.column_index - seat2.column_index)
+        return row_diff + col_diff * COLUMN_DISTANCE_WEIGHT  # Priorizar misma fila
     
 
-    def _get_next_seat(self, seat_type_id: int, available_seats: Dict[int, List[Seat]]) -> Optional[Seat]:
+    def _seat_minors_next_to_adults(self, purchase_groups: Dict[int, List[BoardingPassRecord]],
+                                    available_seats: Dict[int, SeatIndex]) -> None:
+        """Sienta a cada menor sin asiento junto a un adulto de su compra que ya tenga asiento."""
+        for group in purchase_groups.values():
+            minors = [bp for bp in group if not bp.seat_id and bp.passenger.age < 18]
+            if not minors:
+                continue
+            adult_seats = [self.layout.by_id[bp.seat_id] for bp in group
+                           if bp.seat_id and bp.passenger.age >= 18 and bp.seat_id in self.layout.by_id]
+            for bp in minors:
+                index = available_seats.get(bp.seat_type_id)
+                if index is None:
+                    continue
+                seat = next((neighbor for adult_seat in adult_seats
+                             for neighbor in self.layout.neighbors(adult_seat)
+                             if neighbor.seat_type_id == bp.seat_type_id and index.is_free(neighbor.seat_id)), None)
+                if seat:
+                    bp.seat_id = seat.seat_id
+                    index.take(seat)
+
+
+    def _get_next_seat(self, seat_type_id: int, available_seats: Dict[int, SeatIndex]) -> Optional[SeatRecord]:
         """Obtiene siguiente asiento disponible."""
-        if seat_type_id in available_seats and available_seats[seat_type_id]:
-            return available_seats[seat_type_id][0]
+        if seat_type_id in available_seats:
+            return available_seats[seat_type_id].next_free()
         return None
 
 
     ### FUNCIONES PARA ASIGNACIÓN DE ASIENTOS ###
 
-    def _assign_groups_with_minors(self, purchase_groups: Dict[int, List[BoardingPass]], 
-                                  available_seats: Dict[int, List[Seat]], airplane_id: int) -> None:
+    def _assign_groups_with_minors(self, purchase_groups: Dict[int, List[BoardingPassRecord]], 
+                                  available_seats: Dict[int, SeatIndex]) -> None:
         """Asigna grupos con menores, priorizando adulto-menor adyacente."""
         groups_with_minors = [(group) for group in purchase_groups.values() 
                              if any(bp.passenger.age < 18 for bp in group)]
@@ -262,11 +342,11 @@ class SeatAssignmentService:
             
             for seat_type_id, passengers in by_type.items():
                 self._assign_minor_adult_pairs(passengers['minors'], passengers['adults'], 
-                                             seat_type_id, available_seats, airplane_id)
+                                             seat_type_id, available_seats)
     
 
-    def _assign_groups_with_pre_assigned(self, purchase_groups: Dict[int, List[BoardingPass]], 
-                                       available_seats: Dict[int, List[Seat]]) -> None:
+    def _assign_groups_with_pre_assigned(self, purchase_groups: Dict[int, List[BoardingPassRecord]], 
+                                       available_seats: Dict[int, SeatIndex]) -> None:
         """Asigna grupos que ya tienen algunos asientos asignados, juntando el resto cerca."""
         groups_with_assigned = []
         
@@ -287,8 +367,8 @@ class SeatAssignmentService:
             self._assign_near_existing_seats(unassigned, assigned, available_seats)
 
 
-    def _assign_remaining_groups(self, purchase_groups: Dict[int, List[BoardingPass]], 
-                               available_seats: Dict[int, List[Seat]], airplane_id: int) -> None:
+    def _assign_remaining_groups(self, purchase_groups: Dict[int, List[BoardingPassRecord]], 
+                               available_seats: Dict[int, SeatIndex]) -> None:
         """Asigna grupos restantes por tamaño."""
         remaining_groups = [group for group in purchase_groups.values() 
                            if (len(group) > 1 and 
@@ -300,11 +380,11 @@ class SeatAssignmentService:
             for bp in group:
                 by_type[bp.seat_type_id].append(bp)
             for seat_type_id, passengers in by_type.items():
-                self._assign_group_together(passengers, seat_type_id, available_seats, airplane_id)
+                self._assign_group_together(passengers, seat_type_id, available_seats)
 
 
-    def _assign_individuals(self, purchase_groups: Dict[int, List[BoardingPass]], 
-                          available_seats: Dict[int, List[Seat]]) -> None:
+    def _assign_individuals(self, purchase_groups: Dict[int, List[BoardingPassRecord]], 
+                          available_seats: Dict[int, SeatIndex]) -> None:
         """Asigna asientos a todos los pasajeros sin asiento."""
         for group in purchase_groups.values():
             for bp in group:
@@ -312,4 +392,4 @@ class SeatAssignmentService:
                     seat = self._get_next_seat(bp.seat_type_id, available_seats)
                     if seat:
                         bp.seat_id = seat.seat_id
-                        available_seats[seat.seat_type_id].remove(seat)
\ No newline at end of file
+                        available_seats[seat.seat_type_id].take(seat)
\ No newline at end of file
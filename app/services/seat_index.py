@@ -0,0 +1,220 @@
+import heapq
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from collections import defaultdict
+from app.services.layout_cache import AirplaneLayout, SeatRecord
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy está en requirements.txt; esto es solo un resguardo
+    np = None
+
+
+class SeatIndex:
+    """Índice de ocupación de asientos de un tipo, respaldado por arreglos."""
+
+    def __init__(self, seats: List[SeatRecord], layout: Optional[AirplaneLayout] = None):
+        # Asientos ordenados por fila y columna (orden de asignación)
+        self.seats = seats
+        self._position = {seat.seat_id: i for i, seat in enumerate(seats)}
+        self._free = bytearray(b'\x01') * len(seats)
+        self._free_count = len(seats)
+        self._cursor = 0
+        # Posiciones por fila y asientos libres por fila
+        self._rows: Dict[int, List[int]] = defaultdict(list)
+        for i, seat in enumerate(seats):
+            self._rows[seat.seat_row].append(i)
+        self._rows = dict(self._rows)
+        self._row_free = {row: len(positions) for row, positions in self._rows.items()}
+        self._arrays = None
+        # Índice de tramos libres contiguos por (fila, sección)
+        self._segments: List[List[int]] = []
+        self._segment_keys: List[Tuple[int, int]] = []
+        self._segment_of: Dict[int, int] = {}
+        self._row_segments: Dict[int, List[int]] = defaultdict(list)
+        self._segment_runs: List[FrozenSet[Tuple[int, int]]] = []
+        self._run_heaps: Dict[int, list] = defaultdict(list)
+        # Índice de pares adyacentes (misma fila, columnas pegadas), en orden de fila y columna
+        self._pairs: List[Tuple[int, int]] = []
+        self._pairs_of: Dict[int, List[int]] = defaultdict(list)
+        self._pair_cursor = 0
+        self._free_pairs = 0
+        if layout is not None:
+            self._build_neighbors(layout)
+
+    def _build_neighbors(self, layout: AirplaneLayout) -> None:
+        """Arma tramos contiguos y pares adyacentes a partir de los vecinos compilados del avión."""
+        in_segment = set()
+        for position, seat in enumerate(self.seats):
+            neighbor = layout.right_neighbor(seat)
+            neighbor_position = self._position.get(neighbor.seat_id) if neighbor is not None else None
+            if neighbor_position is not None:
+                pair = len(self._pairs)
+                self._pairs.append((position, neighbor_position))
+                self._pairs_of[position].append(pair)
+                self._pairs_of[neighbor_position].append(pair)
+            if position in in_segment or seat.section_id < 0:
+                continue
+            # Un asiento ausente u ocupado de otro tipo corta el tramo
+            chain = [position]
+            while neighbor_position is not None:
+                chain.append(neighbor_position)
+                neighbor = layout.right_neighbor(self.seats[neighbor_position])
+                neighbor_position = self._position.get(neighbor.seat_id) if neighbor is not None else None
+            in_segment.update(chain)
+            self._add_segment(chain, seat.seat_row, seat.section_id)
+        self._free_pairs = len(self._pairs)
+
+    def _add_segment(self, positions: List[int], row: int, section_id: int) -> None:
+        if not positions:
+            return
+        segment = len(self._segments)
+        self._segments.append(positions)
+        self._segment_keys.append((row, section_id))
+        self._row_segments[row].append(segment)
+        for position in positions:
+            self._segment_of[position] = segment
+        self._segment_runs.append(frozenset())
+        self._refresh_runs(segment)
+
+    def _refresh_runs(self, segment: int) -> None:
+        """Recalcula los tramos libres (inicio, largo) de un segmento y publica los nuevos."""
+        runs = []
+        start = None
+        positions = self._segments[segment]
+        for slot, position in enumerate(positions):
+            if self._free[position]:
+                if start is None:
+                    start = slot
+            elif start is not None:
+                runs.append((start, slot - start))
+                start = None
+        if start is not None:
+            runs.append((start, len(positions) - start))
+        previous = self._segment_runs[segment]
+        self._segment_runs[segment] = frozenset(runs)
+        row, section_id = self._segment_keys[segment]
+        for start, length in runs:
+            if (start, length) not in previous:
+                # Los tramos obsoletos se descartan de forma perezosa al consultar
+                heapq.heappush(self._run_heaps[length], (row, section_id, start, segment))
+
+    def __len__(self) -> int:
+        return self._free_count
+
+    def __bool__(self) -> bool:
+        return self._free_count > 0
+
+    def is_free(self, seat_id: int) -> bool:
+        """Indica si el asiento está libre."""
+        position = self._position.get(seat_id)
+        return position is not None and bool(self._free[position])
+
+    def take(self, seat: SeatRecord) -> None:
+        """Marca un asiento como ocupado en O(1)."""
+        position = self._position[seat.seat_id]
+        if not self._free[position]:
+            return
+        # Cada par que incluye este asiento deja de estar libre (O(1): a lo más dos vecinos)
+        for pair in self._pairs_of.get(position, ()):
+            first, second = self._pairs[pair]
+            if self._free[second if first == position else first]:
+                self._free_pairs -= 1
+        self._free[position] = 0
+        self._free_count -= 1
+        self._row_free[seat.seat_row] -= 1
+        segment = self._segment_of.get(position)
+        if segment is not None:
+            self._refresh_runs(segment)
+
+    def next_free(self) -> Optional[SeatRecord]:
+        """Siguiente asiento libre en orden (O(1) amortizado)."""
+        free = self._free
+        cursor = self._cursor
+        while cursor < len(free) and not free[cursor]:
+            cursor += 1
+        self._cursor = cursor
+        return self.seats[cursor] if cursor < len(free) else None
+
+    def iter_free(self) -> Iterator[SeatRecord]:
+        """Itera los asientos libres en orden de fila y columna."""
+        free = self._free
+        for i in range(self._cursor, len(free)):
+            if free[i]:
+                yield self.seats[i]
+
+    def free_in_row(self, row: int) -> List[SeatRecord]:
+        """Asientos libres de una fila, ordenados por columna."""
+        free = self._free
+        return [self.seats[i] for i in self._rows.get(row, ()) if free[i]]
+
+    def arrays(self):
+        """Arreglos NumPy (filas, índices de columna, máscara de libres); la máscara es una vista del índice."""
+        if self._arrays is None:
+            self._arrays = (
+                np.fromiter((seat.seat_row for seat in self.seats), dtype=np.float64, count=len(self.seats)),
+                np.fromiter((seat.column_index for seat in self.seats), dtype=np.float64, count=len(self.seats)),
+                np.frombuffer(self._free, dtype=np.uint8),
+            )
+        return self._arrays
+
+    @property
+    def free_pairs(self) -> int:
+        """Cantidad de pares adyacentes con ambos asientos libres."""
+        return self._free_pairs
+
+    def find_pair(self) -> Optional[Tuple[SeatRecord, SeatRecord]]:
+        """Primer par adyacente libre en orden de fila y columna (O(1) amortizado).
+
+        Los asientos solo se ocupan, nunca se liberan, así que el cursor nunca retrocede.
+        """
+        if not self._free_pairs:
+            return None
+        free = self._free
+        pairs = self._pairs
+        cursor = self._pair_cursor
+        while cursor < len(pairs) and not (free[pairs[cursor][0]] and free[pairs[cursor][1]]):
+            cursor += 1
+        self._pair_cursor = cursor
+        if cursor == len(pairs):
+            return None
+        first, second = pairs[cursor]
+        return self.seats[first], self.seats[second]
+
+    def find_block(self, count: int) -> Optional[List[SeatRecord]]:
+        """Bloque de `count` asientos contiguos con mejor ajuste (tramo libre más corto que alcance).
+
+        Ante empate gana la primera fila y sección. Cada consulta es O(log n) amortizado.
+        """
+        for length in sorted(l for l in self._run_heaps if l >= count):
+            heap = self._run_heaps[length]
+            while heap:
+                row, section_id, start, segment = heap[0]
+                if (start, length) in self._segment_runs[segment]:
+                    positions = self._segments[segment][start:start + count]
+                    return [self.seats[p] for p in positions]
+                heapq.heappop(heap)
+        return None
+
+    def find_row_block(self, count: int) -> Optional[List[SeatRecord]]:
+        """Para grupos sin tramo suficiente: primera fila donde los tramos libres más largos suman `count`."""
+        for row in self.rows_with_free(count):
+            runs = sorted(
+                ((length, segment, start)
+                 for segment in self._row_segments.get(row, ())
+                 for start, length in self._segment_runs[segment]),
+                key=lambda run: -run[0]
+            )
+            if sum(length for length, _, _ in runs) < count:
+                continue
+            positions: List[int] = []
+            for length, segment, start in runs:
+                positions.extend(self._segments[segment][start:start + min(length, count - len(positions))])
+                if len(positions) == count:
+                    return [self.seats[p] for p in sorted(positions)]
+        return None
+
+    def rows_with_free(self, minimum: int = 1) -> Iterator[int]:
+        """Filas (en orden) con al menos `minimum` asientos libres."""
+        for row, count in self._row_free.items():
+            if count >= minimum:
+                yield row
\ No newline at end of file
@@ -0,0 +1,261 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from app.schemas.flight_schemas import FlightHeaderResponse, PassengerResponse
+from app.schemas.serializers import FlightPayload
+from app.utils.case_converter import snake_to_camel
+
+logger = logging.getLogger(__name__)
+
+# Modo de solo lectura: servir las simulaciones desde un snapshot precalculado (sin BD)
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "")
+# Cada cuántos segundos se revisa si el archivo fue reemplazado por uno nuevo
+SNAPSHOT_CHECK_INTERVAL = float(os.getenv("SNAPSHOT_CHECK_INTERVAL", "5"))
+
+MAGIC = b"CKSNAP\x00\x00"
+FORMAT_VERSION = 1
+
+# Encabezado: magic, versión, vuelos, pasajeros, offsets y tamaños de las secciones, id del contenido
+HEADER = struct.Struct("<8sIIQQQQ16s")
+
+
+class SnapshotError(Exception):
+    """El archivo no es un snapshot válido o es de otra versión del formato."""
+
+
+class RecordLayout:
+    """Registro de ancho fijo para los campos de un esquema, en su orden.
+
+    Los enteros ocupan 8 bytes y los textos un par (offset, largo) en el pool de textos;
+    una máscara final marca los campos nulos. `extra` agrega campos al final del registro.
+    """
+
+    def __init__(self, model, extra: str = ""):
+        self.fields: Tuple[Tuple[str, bool], ...] = tuple(
+            (field.alias or snake_to_camel(name), field.annotation is str)
+            for name, field in model.model_fields.items()
+        )
+        codes = "".join("II" if is_text else "q" for _, is_text in self.fields)
+        self.extra = len(extra)
+        self.struct = struct.Struct(f"<{codes}{extra}I")
+
+    def pack(self, row: dict, intern: Callable[[str], Tuple[int, int]], *extra: int) -> bytes:
+        values = []
+        nulls = 0
+        for bit, (key, is_text) in enumerate(self.fields):
+            value = row[key]
+            if value is None:
+                nulls |= 1 << bit
+                values.extend((0, 0) if is_text else (0,))
+            elif is_text:
+                values.extend(intern(value))
+            else:
+                values.append(value)
+        return self.struct.pack(*values, *extra, nulls)
+
+    def unpack(self, values: tuple, text: Callable[[int, int], str]) -> dict:
+        row = {}
+        nulls = values[-1]
+        i = 0
+        for bit, (key, is_text) in enumerate(self.fields):
+            if is_text:
+                row[key] = None if nulls >> bit & 1 else text(values[i], values[i + 1])
+                i += 2
+            else:
+                row[key] = None if nulls >> bit & 1 else values[i]
+                i += 1
+        return row
+
+    def extras(self, values: tuple) -> tuple:
+        return values[-1 - self.extra:-1]
+
+
+# Índice de vuelos (ordenado por flightId): encabezado + (primer pasajero, cantidad)
+FLIGHT_RECORD = RecordLayout(FlightHeaderResponse, "QI")
+PASSENGER_RECORD = RecordLayout(PassengerResponse)
+# flightId es el primer campo del registro de vuelo (búsqueda binaria sin decodificar)
+_FLIGHT_ID = struct.Struct("<q")
+
+
+class SnapshotWriter:
+    """Escribe un snapshot: encabezado, arreglo de pasajeros, índice de vuelos y pool de textos.
+
+    Se escribe en un archivo temporal que reemplaza al destino de forma atómica al cerrar,
+    así los procesos que ya lo tienen mapeado siguen leyendo la versión anterior.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(bytes(HEADER.size))
+        self._hash = hashlib.blake2b(digest_size=16)
+        self._flights: List[Tuple[int, bytes]] = []
+        self._passengers = 0
+        self._texts: Dict[str, Tuple[int, int]] = {}
+        self._pool = bytearray()
+
+    def _intern(self, value: str) -> Tuple[int, int]:
+        ref = self._texts.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = self._texts[value] = (len(self._pool), len(encoded))
+            self._pool += encoded
+        return ref
+
+    def _write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._hash.update(chunk)
+
+    def add(self, payload: FlightPayload) -> None:
+        """Agrega un vuelo simulado; los pasajeros se escriben de inmediato."""
+        self._write(b"".join(PASSENGER_RECORD.pack(passenger, self._intern) for passenger in payload.passengers))
+        self._flights.append((payload.header["flightId"], FLIGHT_RECORD.pack(
+            payload.header, self._intern, self._passengers, len(payload.passengers))))
+        self._passengers += len(payload.passengers)
+
+    def close(self) -> None:
+        flights_offset = HEADER.size + self._passengers * PASSENGER_RECORD.struct.size
+        self._flights.sort(key=lambda flight: flight[0])
+        self._write(b"".join(record for _, record in self._flights))
+        self._write(bytes(self._pool))
+        strings_offset = flights_offset + len(self._flights) * FLIGHT_RECORD.struct.size
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self._flights), self._passengers,
+                                     flights_offset, strings_offset, len(self._pool), self._hash.digest()))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class Snapshot:
+    """Snapshot mapeado en memoria (solo lectura).
+
+    El mapeo es compartido: todos los procesos que abren el mismo archivo usan las mismas
+    páginas del cache del sistema operativo, sin copiar el contenido.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            raise SnapshotError(f"{path}: archivo truncado")
+        (magic, version, self.flight_count, self.passenger_count,
+         self._flights_offset, self._strings_offset, strings_size, content_id) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise SnapshotError(f"{path}: no es un snapshot de versión {FORMAT_VERSION}")
+        if self._strings_offset + strings_size != len(self._mmap):
+            raise SnapshotError(f"{path}: tamaño inconsistente")
+        self.path = path
+        # Cambia con el contenido: sirve como versión para los ETag
+        self.content_id = content_id.hex()
+
+    def __len__(self) -> int:
+        return self.flight_count
+
+    def _flight_offset(self, index: int) -> int:
+        return self._flights_offset + index * FLIGHT_RECORD.struct.size
+
+    def _flight_id(self, index: int) -> int:
+        return _FLIGHT_ID.unpack_from(self._mmap, self._flight_offset(index))[0]
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._strings_offset + offset
+        return str(self._mmap[start:start + length], "utf-8")
+
+    def __contains__(self, flight_id: int) -> bool:
+        return self._find(flight_id) is not None
+
+    def _find(self, flight_id: int) -> Optional[int]:
+        # Búsqueda binaria leyendo solo el flightId de cada registro (bisect con key= exige 3.10)
+        low, high = 0, self.flight_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._flight_id(middle) < flight_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.flight_count and self._flight_id(low) == flight_id:
+            return low
+        return None
+
+    def payload(self, flight_id: int) -> Optional[FlightPayload]:
+        """Resultado del vuelo leído del snapshot, o None si el vuelo no está."""
+        index = self._find(flight_id)
+        if index is None:
+            return None
+        values = FLIGHT_RECORD.struct.unpack_from(self._mmap, self._flight_offset(index))
+        first, count = FLIGHT_RECORD.extras(values)
+        start = HEADER.size + first * PASSENGER_RECORD.struct.size
+        with memoryview(self._mmap)[start:start + count * PASSENGER_RECORD.struct.size] as records:
+            passengers = [PASSENGER_RECORD.unpack(record, self._text)
+                          for record in PASSENGER_RECORD.struct.iter_unpack(records)]
+        return FlightPayload(FLIGHT_RECORD.unpack(values, self._text), passengers)
+
+
+class SnapshotStore:
+    """Snapshot vigente de un proceso; lo reemplaza sin reiniciar cuando cambia el archivo.
+
+    Las peticiones en curso conservan la referencia al snapshot anterior, que se libera
+    cuando dejan de usarlo.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._snapshot: Optional[Snapshot] = None
+        self._version: Optional[Tuple[int, int, int]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[Snapshot]:
+        """Snapshot vigente; revisa el archivo a lo más una vez por `check_interval`."""
+        if time.monotonic() >= self._next_check:
+            self.reload()
+        return self._snapshot
+
+    def reload(self) -> bool:
+        """Abre el archivo si cambió desde la última carga. Retorna True si hubo reemplazo."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return False
+            version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if version == self._version:
+                return False
+            try:
+                snapshot = Snapshot(self.path)
+            except (OSError, ValueError, SnapshotError) as e:
+                # Se sigue sirviendo el snapshot anterior
+                logger.warning("No se pudo cargar el snapshot %s: %s", self.path, e)
+                return False
+            self._snapshot, self._version = snapshot, version
+            self.reloads += 1
+        logger.info("Snapshot cargado: %s (%d vuelos, %d pasajeros)",
+                    self.path, snapshot.flight_count, snapshot.passenger_count)
+        return True
+
+
+snapshot_store = SnapshotStore(SNAPSHOT_PATH, SNAPSHOT_CHECK_INTERVAL) if SNAPSHOT_PATH else None
@@ -0,0 +1,77 @@
+import logging
+import os
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import BoardingPass
+from app.services.records import BoardingPassRecord, FlightRecord
+from app.services.result_cache import fingerprint_statement, flight_fingerprint
+from app.utils.metrics import WRITE_BACKS
+
+logger = logging.getLogger(__name__)
+
+# Modo opcional: guardar en la BD los asientos asignados por la simulación
+PERSIST_ASSIGNMENTS = os.getenv("PERSIST_ASSIGNMENTS", "false").lower() == "true"
+
+
+class StaleFlightError(Exception):
+    """Los boarding passes del vuelo cambiaron entre la simulación y la escritura."""
+
+
+def assignment_update_statement():
+    """UPDATE por boarding pass para executemany; solo escribe asientos que siguen vacíos."""
+    table = BoardingPass.__table__
+    return (
+        update(table)
+        .where(
+            table.c.boarding_pass_id == bindparam("b_boarding_pass_id"),
+            table.c.flight_id == bindparam("b_flight_id"),
+            table.c.seat_id.is_(None),
+        )
+        .values(seat_id=bindparam("b_seat_id"))
+    )
+
+
+def unassigned_ids(boarding_passes: Iterable[BoardingPassRecord]) -> Set[int]:
+    """Boarding passes sin asiento antes de la simulación."""
+    return {bp.boarding_pass_id for bp in boarding_passes if not bp.seat_id}
+
+
+def assignment_params(boarding_passes: Iterable[BoardingPassRecord], pending: Set[int]) -> List[Dict[str, int]]:
+    """Parámetros del UPDATE para los boarding passes que recibieron asiento en la simulación."""
+    return [
+        {"b_boarding_pass_id": bp.boarding_pass_id, "b_flight_id": bp.flight_id, "b_seat_id": bp.seat_id}
+        for bp in boarding_passes
+        if bp.boarding_pass_id in pending and bp.seat_id
+    ]
+
+
+async def persist_assignments(db: AsyncSession, flight: FlightRecord, fingerprint: Hashable,
+                              boarding_passes: List[BoardingPassRecord],
+                              pending: Set[int]) -> Optional[Hashable]:
+    """Escribe las asignaciones del vuelo en una transacción con concurrencia optimista.
+
+    Retorna la nueva huella del vuelo, o None si otro proceso modificó el vuelo
+    (en ese caso no se escribe nada).
+    """
+    params = assignment_params(boarding_passes, pending)
+    if not params:
+        return fingerprint
+    # Cerrar la transacción de lectura para que la verificación vea los datos actuales
+    await db.commit()
+    try:
+        async with db.begin():
+            aggregates = (await db.execute(fingerprint_statement(flight.flight_id))).one()
+            if flight_fingerprint(flight, aggregates) != fingerprint:
+                raise StaleFlightError(flight.flight_id)
+            result = await db.execute(assignment_update_statement(), params)
+            # Algún asiento ya fue escrito por otra petición: se descarta todo el lote
+            if result.rowcount != len(params):
+                raise StaleFlightError(flight.flight_id)
+            aggregates = (await db.execute(fingerprint_statement(flight.flight_id))).one()
+    except StaleFlightError:
+        logger.info("Vuelo %s modificado durante la simulación; asignaciones no guardadas", flight.flight_id)
+        WRITE_BACKS.inc(1, "conflict")
+        return None
+    WRITE_BACKS.inc(1, "committed")
+    return flight_fingerprint(flight, aggregates)
@@ -0,0 +1,215 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Buckets por defecto (segundos), pensados para latencias de 100 µs a 10 s
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Histograma de buckets fijos con etiquetas; observe() es O(log buckets)."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # etiquetas -> [conteo por bucket..., +Inf], suma
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+        for label_values, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {repr(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}"
+
+
+class Counter:
+    """Contador monótono con etiquetas."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Gauge:
+    """Valor calculado al momento de exponer las métricas (p. ej. estadísticas de un cache)."""
+
+    def __init__(self, name: str, help_text: str, collect: Callable[[], float], metric_type: str = "gauge"):
+        self.name = name
+        self.help_text = help_text
+        self.collect = collect
+        self.metric_type = metric_type
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        yield f"{self.name} {_format_value(self.collect())}"
+
+
+class MetricsRegistry:
+    """Registro de métricas del proceso, expuesto en formato de texto de Prometheus."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, collect: Callable[[], float],
+              metric_type: str = "gauge") -> Gauge:
+        return self.register(Gauge(name, help_text, collect, metric_type))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+REQUEST_SECONDS = metrics.histogram(
+    "checkin_request_seconds", "Duración de las peticiones HTTP", ("method", "route", "status"))
+PHASE_SECONDS = metrics.histogram(
+    "checkin_assignment_phase_seconds", "Duración de cada fase de la asignación de asientos", ("phase",))
+DB_QUERIES = metrics.histogram(
+    "checkin_db_queries_per_request", "Consultas a la base de datos por petición", (),
+    buckets=(0, 1, 2, 3, 4, 5, 8, 10, 20, 50))
+DB_SECONDS = metrics.histogram(
+    "checkin_db_seconds_per_request", "Tiempo total en consultas a la base de datos por petición")
+PASSENGERS_PROCESSED = metrics.counter(
+    "checkin_passengers_processed_total", "Pasajeros procesados por la asignación de asientos")
+SEATS_PROCESSED = metrics.counter(
+    "checkin_seats_processed_total", "Asientos de avión considerados por la asignación de asientos")
+WRITE_BACKS = metrics.counter(
+    "checkin_assignment_write_backs_total", "Escrituras de asignaciones en la BD por resultado", ("result",))
+
+
+# Consultas a la BD de la petición en curso: [cantidad, segundos]
+_request_queries: ContextVar[Optional[List[float]]] = ContextVar("request_queries", default=None)
+
+
+def start_request_tracking() -> List[float]:
+    stats = [0, 0.0]
+    _request_queries.set(stats)
+    return stats
+
+
+def record_query(seconds: float) -> None:
+    stats = _request_queries.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += seconds
+
+
+def instrument_engine(engine) -> None:
+    """Registra cantidad y tiempo de consultas de un Engine (o del sync_engine de un AsyncEngine)."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        record_query(time.perf_counter() - started)
+
+
+def record_assignment(timings: Dict[str, float], passengers: int, seats: int) -> None:
+    """Publica los tiempos por fase y volúmenes de una asignación."""
+    for phase, seconds in timings.items():
+        PHASE_SECONDS.observe(seconds, phase)
+    PASSENGERS_PROCESSED.inc(passengers)
+    SEATS_PROCESSED.inc(seats)
+
+
+class Profiler:
+    """Perfilado opcional por petición (cProfile), activable en tiempo de ejecución."""
+
+    def __init__(self, enabled: bool = False, top: int = 25):
+        self.enabled = enabled
+        self.top = top
+
+    @contextmanager
+    def section(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            output = io.StringIO()
+            pstats.Stats(profile, stream=output).sort_stats("cumulative").print_stats(self.top)
+            logger.info("Perfil de %s:\n%s", name, output.getvalue())
+
+
+profiler = Profiler(enabled=os.getenv("PROFILING_ENABLED", "false").lower() == "true")
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Generador de datos sintéticos sobre el esquema de app.models.models (SQLite).
+
+Crea un avión, un vuelo y sus compras/pasajeros/boarding passes según un escenario
+reproducible (misma semilla = mismos datos).
+"""
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from app.database import Base
+from app.models.models import Airplane, BoardingPass, Flight, Passenger, Purchase, Seat, SeatType
+
+# Columnas por distribución de avión; una letra ausente es un pasillo
+LAYOUTS = {
+    "1": "ABCEFG",          # ABC EFG
+    "2": "ABDEFHI",         # AB DEF HI
+    "widebody": "ABCEFGHJKL",  # ABC EFGH JKL
+}
+
+# Proporción de filas por tipo de asiento (primera clase, premium, económica)
+SEAT_TYPE_SHARE = ((1, 0.05), (2, 0.15), (3, 0.80))
+
+AIRPLANE_ID = 1
+FLIGHT_ID = 1
+
+
+def parse_group_sizes(spec: str) -> Dict[int, float]:
+    """Convierte "1:40,2:30,4:10" en {tamaño de grupo: peso}."""
+    sizes = {}
+    for item in spec.split(","):
+        size, weight = item.split(":")
+        sizes[int(size)] = float(weight)
+    return sizes
+
+
+@dataclass
+class Scenario:
+    passengers: int
+    layout: str = "widebody"
+    group_sizes: Dict[int, float] = field(default_factory=lambda: {1: 40, 2: 30, 3: 15, 4: 10, 6: 5})
+    minor_ratio: float = 0.15
+    pre_assigned_ratio: float = 0.10
+    occupancy: float = 0.95
+    seed: int = 2025
+
+    @property
+    def name(self) -> str:
+        return f"{self.layout}-{self.passengers}"
+
+
+def _seat_rows(scenario: Scenario) -> List[dict]:
+    columns = LAYOUTS[scenario.layout]
+    rows = math.ceil(scenario.passengers / scenario.occupancy / len(columns))
+    seats = []
+    first_row = 1
+    for seat_type_id, share in SEAT_TYPE_SHARE:
+        type_rows = max(1, round(rows * share))
+        for seat_row in range(first_row, first_row + type_rows):
+            for seat_column in columns:
+                seats.append({
+                    "seat_id": len(seats) + 1, "seat_column": seat_column, "seat_row": seat_row,
+                    "seat_type_id": seat_type_id, "airplane_id": AIRPLANE_ID,
+                })
+        first_row += type_rows
+    return seats
+
+
+def populate(engine: Engine, scenario: Scenario) -> None:
+    """Crea el esquema y carga un vuelo según el escenario."""
+    rnd = random.Random(scenario.seed)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    seats = _seat_rows(scenario)
+    free_by_type: Dict[int, List[int]] = {}
+    for seat in seats:
+        free_by_type.setdefault(seat["seat_type_id"], []).append(seat["seat_id"])
+    for seat_ids in free_by_type.values():
+        rnd.shuffle(seat_ids)
+    capacity = {seat_type_id: len(seat_ids) for seat_type_id, seat_ids in free_by_type.items()}
+    remaining = dict(capacity)
+
+    sizes = list(scenario.group_sizes)
+    weights = [scenario.group_sizes[size] for size in sizes]
+    purchases, passengers, boarding_passes = [], [], []
+    while len(boarding_passes) < scenario.passengers:
+        size = min(rnd.choices(sizes, weights)[0], scenario.passengers - len(boarding_passes))
+        # Tipo de asiento proporcional a la capacidad restante
+        candidates = [t for t, left in remaining.items() if left >= size]
+        if not candidates:
+            break
+        seat_type_id = rnd.choices(candidates, [remaining[t] for t in candidates])[0]
+        remaining[seat_type_id] -= size
+        purchase_id = len(purchases) + 1
+        purchases.append({"purchase_id": purchase_id, "purchase_date": None})
+        # Todo grupo con menores tiene al menos un adulto
+        minors = sum(rnd.random() < scenario.minor_ratio for _ in range(size - 1)) if size > 1 else 0
+        for i in range(size):
+            passenger_id = len(passengers) + 1
+            age = rnd.randint(1, 17) if i < minors else rnd.randint(18, 85)
+            passengers.append({
+                "passenger_id": passenger_id, "dni": 10_000_000 + passenger_id,
+                "name": f"Pasajero {passenger_id}", "age": age, "country": "Chile",
+            })
+            seat_id = None
+            if rnd.random() < scenario.pre_assigned_ratio:
+                seat_id = free_by_type[seat_type_id].pop()
+            boarding_passes.append({
+                "purchase_id": purchase_id,
+                "passenger_id": passenger_id, "seat_type_id": seat_type_id,
+                "seat_id": seat_id, "flight_id": FLIGHT_ID,
+            })
+    # Los boarding passes no llegan agrupados por compra: se numeran después de mezclarlos
+    rnd.shuffle(boarding_passes)
+    for i, bp in enumerate(boarding_passes, start=1):
+        bp["boarding_pass_id"] = i
+
+    with engine.begin() as connection:
+        connection.execute(insert(SeatType), [
+            {"seat_type_id": t, "name": name}
+            for t, name in ((1, "Primera clase"), (2, "Clase económica premium"), (3, "Clase económica"))
+        ])
+        connection.execute(insert(Airplane), [{"airplane_id": AIRPLANE_ID, "name": scenario.layout}])
+        connection.execute(insert(Flight), [{
+            "flight_id": FLIGHT_ID, "takeoff_date_time": 1688207580, "takeoff_airport": "SCL",
+            "landing_date_time": 1688221980, "landing_airport": "LIM", "airplane_id": AIRPLANE_ID,
+        }])
+        connection.execute(insert(Seat), seats)
+        connection.execute(insert(Purchase), purchases)
+        connection.execute(insert(Passenger), passengers)
+        connection.execute(insert(BoardingPass), boarding_passes)
+
+
+def create_database(path: str, scenario: Scenario) -> Engine:
+    """Crea una base SQLite en `path` con los datos del escenario."""
+    engine = create_engine(f"sqlite:///{path}")
+    populate(engine, scenario)
+    return engine
\ No newline at end of file
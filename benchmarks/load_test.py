@@ -0,0 +1,183 @@
+"""
+Prueba de carga de GET /flights/{id}/passengers contra gunicorn sobre una base SQLite sintética.
+
+Para cada cantidad de workers levanta gunicorn con gunicorn.conf.py, envía peticiones con
+`--concurrency` conexiones keep-alive durante `--duration` segundos y reporta throughput y
+latencias p50/p95/p99.
+
+Ejemplos:
+    python -m benchmarks.load_test --workers 1 2 4
+    python -m benchmarks.load_test --workers 4 --passengers 1000 --concurrency 64 --simulation-cache-size 256
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+from benchmarks.data_generator import FLIGHT_ID, LAYOUTS, Scenario, create_database
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Prueba de carga del endpoint de pasajeros por cantidad de workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="Cantidades de workers de gunicorn a medir")
+    parser.add_argument("--concurrency", type=int, default=32, help="Conexiones simultáneas")
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos de medición por cantidad de workers")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Segundos de calentamiento (no se miden)")
+    parser.add_argument("--passengers", type=int, default=1000, help="Pasajeros del vuelo sintético")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="widebody")
+    parser.add_argument("--simulation-cache-size", type=int, default=0,
+                        help="SIMULATION_CACHE_SIZE de la API (0 = simular en cada petición)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", dest="json_output", help="Guardar los resultados en este archivo JSON")
+    return parser.parse_args(argv)
+
+
+async def _get(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: bytes) -> int:
+    """Una petición HTTP/1.1 sobre la conexión abierta; retorna el código de estado."""
+    writer.write(request)
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("conexión cerrada por el servidor")
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _client(port: int, request: bytes, measure_from: float, deadline: float,
+                  latencies: List[float], errors: List[int]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while True:
+            started = time.perf_counter()
+            if started >= deadline:
+                return
+            try:
+                status = await _get(reader, writer, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                errors.append(0)
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                continue
+            if started < measure_from:
+                continue
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(port: int, concurrency: int, warmup: float, duration: float) -> Tuple[List[float], List[int]]:
+    request = (f"GET /flights/{FLIGHT_ID}/passengers HTTP/1.1\r\n"
+               f"Host: 127.0.0.1:{port}\r\n\r\n").encode()
+    latencies: List[float] = []
+    errors: List[int] = []
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+    await asyncio.gather(*(
+        _client(port, request, measure_from, deadline, latencies, errors) for _ in range(concurrency)
+    ))
+    return latencies, errors
+
+
+def summarize(workers: int, latencies: List[float], errors: List[int], duration: float) -> Dict:
+    """Throughput y percentiles (ms) de una medición."""
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentiles[49] * 1000, 2),
+        "p95_ms": round(percentiles[94] * 1000, 2),
+        "p99_ms": round(percentiles[98] * 1000, 2),
+    }
+
+
+def _wait_ready(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """Espera a que la API responda en GET /."""
+    request = f"GET / HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n".encode()
+
+    async def probe() -> int:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            return await _get(reader, writer, request)
+        finally:
+            writer.close()
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn terminó con código {process.returncode}")
+        try:
+            if asyncio.run(probe()) == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("gunicorn no respondió a tiempo")
+
+
+def measure(args: argparse.Namespace, database: str, workers: int) -> Dict:
+    """Levanta gunicorn con `workers` procesos, ejecuta la carga y lo detiene."""
+    env = dict(
+        os.environ,
+        BIND=f"127.0.0.1:{args.port}",
+        WEB_WORKERS=str(workers),
+        DATABASE_URL=f"sqlite:///{database}",
+        ASYNC_DATABASE_URL=f"sqlite+aiosqlite:///{database}",
+        SIMULATION_CACHE_SIZE=str(args.simulation_cache_size),
+        SIMULATION_WORKERS="1",
+        LOG_LEVEL="warning",
+    )
+    env.pop("ACCESS_LOG", None)
+    env.pop("SNAPSHOT_PATH", None)
+    process = subprocess.Popen([sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py"],
+                               cwd=ROOT, env=env)
+    try:
+        _wait_ready(args.port, process)
+        latencies, errors = asyncio.run(run_load(args.port, args.concurrency, args.warmup, args.duration))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return summarize(workers, latencies, errors, args.duration)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    scenario = Scenario(passengers=args.passengers, layout=args.layout)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "load.db")
+        create_database(database, scenario).dispose()
+        print(f"Escenario {scenario.name}, {args.concurrency} conexiones, {args.duration:g} s por medición")
+        print(f"{'workers':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errores':>8}")
+        for workers in args.workers:
+            result = measure(args, database, workers)
+            results.append(result)
+            print(f"{result['workers']:>8} {result['rps']:>9} {result['p50_ms']:>9} "
+                  f"{result['p95_ms']:>9} {result['p99_ms']:>9} {result['errors']:>8}")
+    if args.json_output:
+        with open(args.json_output, "w") as file:
+            json.dump({"scenario": scenario.name, "concurrency": args.concurrency, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark reproducible del motor de asignación de asientos sobre SQLite.
+
+Mide cada fase de SeatAssignmentService y el total de cargar el vuelo y asignarlo
+(load_flight + assign_seats) para varios tamaños de vuelo, guarda los resultados
+en un archivo de línea base y marca regresiones sobre un umbral.
+
+Ejemplos:
+    python -m benchmarks.seat_assignment --save-baseline
+    python -m benchmarks.seat_assignment --sizes 100 1000 --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+from sqlalchemy.orm import sessionmaker
+from app.services.layout_cache import seat_layout_cache
+from app.services.loader import load_flight
+from app.services.seat_assignment import SeatAssignmentService
+from benchmarks.data_generator import FLIGHT_ID, LAYOUTS, Scenario, create_database, parse_group_sizes
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def run_scenario(scenario: Scenario, repeat: int) -> Dict:
+    """Ejecuta un escenario `repeat` veces y retorna la mediana (ms) del total y de cada fase."""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_database(os.path.join(directory, "bench.db"), scenario)
+        Session = sessionmaker(bind=engine)
+        totals: List[float] = []
+        phases: Dict[str, List[float]] = {}
+        # Una pasada de calentamiento (carga la distribución en el cache del proceso)
+        seat_layout_cache.invalidate()
+        with Session() as db:
+            SeatAssignmentService().assign_seats(*load_flight(db, FLIGHT_ID))
+        for _ in range(repeat):
+            with Session() as db:
+                service = SeatAssignmentService()
+                started = time.perf_counter()
+                service.assign_seats(*load_flight(db, FLIGHT_ID))
+                totals.append(time.perf_counter() - started)
+            for phase, seconds in service.timings.items():
+                phases.setdefault(phase, []).append(seconds)
+        engine.dispose()
+    return {
+        "passengers": scenario.passengers,
+        "total_ms": round(statistics.median(totals) * 1000, 3),
+        "phases_ms": {phase: round(statistics.median(values) * 1000, 3) for phase, values in phases.items()},
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Lista de regresiones: métricas más lentas que la línea base por sobre el umbral."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        metrics = [("total", result["total_ms"], base["total_ms"])]
+        metrics += [(phase, value, base["phases_ms"].get(phase)) for phase, value in result["phases_ms"].items()]
+        for metric, value, reference in metrics:
+            if reference and value > reference * (1 + threshold):
+                regressions.append(
+                    f"{name} {metric}: {value:.3f} ms vs {reference:.3f} ms (+{(value / reference - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark del motor de asignación de asientos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Cantidad de pasajeros por vuelo")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="widebody")
+    parser.add_argument("--group-sizes", default="1:40,2:30,3:15,4:10,6:5",
+                        help="Distribución de tamaños de compra (tamaño:peso,...)")
+    parser.add_argument("--minor-ratio", type=float, default=0.15)
+    parser.add_argument("--pre-assigned-ratio", type=float, default=0.10)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Archivo JSON de línea base")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como línea base")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Regresión permitida sobre la línea base (0.20 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = {}
+    for size in args.sizes:
+        scenario = Scenario(
+            passengers=size, layout=args.layout, group_sizes=parse_group_sizes(args.group_sizes),
+            minor_ratio=args.minor_ratio, pre_assigned_ratio=args.pre_assigned_ratio, seed=args.seed,
+        )
+        result = run_scenario(scenario, args.repeat)
+        results[scenario.name] = result
+        phases = "  ".join(f"{phase}={ms:.2f}" for phase, ms in result["phases_ms"].items())
+        print(f"{scenario.name:>18}  total={result['total_ms']:.2f} ms  {phases}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "parameters": {key: value for key, value in vars(args).items()
+                               if key not in ("baseline", "save_baseline", "threshold")},
+                "results": results,
+            }, baseline_file, indent=2)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Sin línea base para comparar (usar --save-baseline)")
+        return 0
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        regressions = compare(results, json.load(baseline_file), args.threshold)
+    for regression in regressions:
+        print(f"REGRESIÓN {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Configuración de gunicorn para producción (workers de uvicorn).
+
+La aplicación y las distribuciones de asientos se cargan en el proceso maestro antes de
+crear los workers, así sus páginas quedan compartidas (copy-on-write).
+
+Ejemplo:
+    gunicorn app.main:app -c gunicorn.conf.py
+"""
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1)))
+# La aplicación se importa después: el pool de simulaciones en lote reparte los núcleos entre los workers
+os.environ["WEB_WORKERS"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+# Importar la aplicación en el maestro, antes del fork
+preload_app = True
+
+# Segundos sin respuesta de un worker antes de reiniciarlo
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+# Segundos para terminar las peticiones en curso al reiniciar o detener
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+# Reinicio periódico de workers (0 = nunca), con variación para que no reinicien todos juntos
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "0"))
+
+accesslog = os.getenv("ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    """Carga el estado compartido en el maestro (después de preload_app, antes de los workers)."""
+    from app.main import preload_shared_state
+    try:
+        loaded = preload_shared_state()
+        server.log.info("%d distribuciones cargadas antes de crear los workers", loaded)
+    except Exception as e:
+        # Sin base de datos se inicia igual; cada worker reintenta en su arranque
+        server.log.warning("No se pudo precargar el estado compartido: %s", e)
+    # Los objetos ya creados no los recorre el GC, que si no ensuciaría las páginas compartidas
+    gc.freeze()
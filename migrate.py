@@ -0,0 +1,51 @@
+"""
+Índices de las consultas calientes: los crea si faltan y verifica sus planes de ejecución.
+
+Usa DATABASE_URL (SQLite en local, MySQL en producción). Ejecuta EXPLAIN sobre las consultas
+del servicio y termina con código 1 si alguna recorre una tabla completa.
+
+Ejemplos:
+    python migrate.py            # crear índices faltantes y verificar
+    python migrate.py --check    # solo verificar (sin modificar el esquema)
+"""
+import argparse
+import sys
+from app.database import engine
+from app.services.indexes import create_indexes, explain_hot_queries, full_scans, missing_indexes
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Índices y planes de ejecución de las consultas calientes")
+    parser.add_argument("--check", action="store_true",
+                        help="Solo verificar: no crear índices")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Mostrar el plan completo de cada consulta")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.check:
+        for index in missing_indexes(engine):
+            print(f"falta el índice {index.name} en {index.table.name}", file=sys.stderr)
+    else:
+        for name in create_indexes(engine):
+            print(f"índice creado: {name}", file=sys.stderr)
+
+    plans = explain_hot_queries(engine)
+    if args.verbose:
+        for name, steps in plans.items():
+            for step in steps:
+                print(f"{name}: {step.detail}", file=sys.stderr)
+    scans = full_scans(plans)
+    for name, steps in scans.items():
+        for step in steps:
+            print(f"recorrido completo en {name}: {step.table} ({step.detail})", file=sys.stderr)
+    if scans:
+        return 1
+    print(f"{len(plans)} consultas calientes sin recorridos completos", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,11 @@
+import os
+import sys
 import uvicorn
 
 if __name__ == "__main__":
+    if "--prod" in sys.argv[1:]:
+        # Producción: gunicorn con workers de uvicorn y estado precargado (gunicorn.conf.py)
+        os.execvp("gunicorn", ["gunicorn", "app.main:app", "-c", "gunicorn.conf.py"])
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
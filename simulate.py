@@ -0,0 +1,153 @@
+"""
+Simulación de check-in en lote, directamente contra la base de datos.
+
+Recorre los boarding passes por páginas de vuelos consecutivos (por flight_id), reparte
+los vuelos entre procesos y escribe un FlightResponse en camelCase por línea (JSONL).
+Con --snapshot escribe en cambio un snapshot binario para servir la API sin BD (SNAPSHOT_PATH).
+
+Ejemplos:
+    python simulate.py --output simulacion.jsonl
+    python simulate.py --flight-id 1 --flight-id 2
+    python simulate.py --takeoff-from 1688169600 --takeoff-to 1688255999 --workers 8
+    python simulate.py --snapshot checkin.snap
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import attrgetter
+from typing import Dict, Iterator, List
+from sqlalchemy import func, select
+from app.database import SessionLocal
+from app.models.models import BoardingPass, Flight
+from app.services.batch import simulate_flight_json, simulate_flight_payload
+from app.services.layout_cache import seat_layout_cache
+from app.services.records import FlightRecord, boarding_pass_rows_statement, flight_rows_statement
+from app.services.snapshot import SnapshotWriter
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulación de check-in para todos los vuelos (salida JSONL)")
+    parser.add_argument("--flight-id", type=int, action="append", dest="flight_ids",
+                        help="Vuelo a simular (se puede repetir)")
+    parser.add_argument("--takeoff-from", type=int, help="Despegue desde (Unix timestamp, inclusive)")
+    parser.add_argument("--takeoff-to", type=int, help="Despegue hasta (Unix timestamp, inclusive)")
+    parser.add_argument("--output", "-o", default="-", help="Archivo de salida JSONL (por defecto stdout)")
+    parser.add_argument("--snapshot", help="Escribir un snapshot binario en esta ruta (en lugar de JSONL)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Procesos para la asignación (1 = sin procesos)")
+    parser.add_argument("--page-size", type=int, default=5000,
+                        help="Boarding passes por página (aproximado: un vuelo no se divide entre páginas)")
+    return parser.parse_args(argv)
+
+
+def _flight_filter(args: argparse.Namespace) -> list:
+    conditions = []
+    if args.flight_ids:
+        conditions.append(Flight.flight_id.in_(args.flight_ids))
+    if args.takeoff_from is not None:
+        conditions.append(Flight.takeoff_date_time >= args.takeoff_from)
+    if args.takeoff_to is not None:
+        conditions.append(Flight.takeoff_date_time <= args.takeoff_to)
+    return conditions
+
+
+# Máximo de vuelos por página (acota el IN de la consulta de boarding passes)
+MAX_FLIGHTS_PER_PAGE = 1000
+
+
+def _pages(flights: List[FlightRecord], counts: Dict[int, int], page_size: int) -> Iterator[List[FlightRecord]]:
+    """Agrupa vuelos consecutivos hasta juntar unos `page_size` boarding passes (un vuelo nunca se divide)."""
+    page: List[FlightRecord] = []
+    rows = 0
+    for flight in flights:
+        page.append(flight)
+        rows += counts.get(flight.flight_id, 0)
+        if rows >= page_size or len(page) >= MAX_FLIGHTS_PER_PAGE:
+            yield page
+            page, rows = [], 0
+    if page:
+        yield page
+
+
+def iter_flights(db, args: argparse.Namespace):
+    """Genera (vuelo, filas de boarding passes) en orden de flight_id, incluyendo vuelos vacíos.
+
+    Los boarding passes se leen por páginas de vuelos consecutivos: cada consulta trae
+    unos --page-size registros y se consume completa antes de la siguiente, sin depender de
+    cursores del lado del servidor (mysqlconnector no los tiene).
+    """
+    conditions = _flight_filter(args)
+    flights = [FlightRecord(*row) for row in db.execute(
+        flight_rows_statement().where(*conditions).order_by(Flight.flight_id)
+    )]
+    count_statement = select(BoardingPass.flight_id, func.count()).group_by(BoardingPass.flight_id)
+    if conditions:
+        count_statement = count_statement.where(
+            BoardingPass.flight_id.in_(select(Flight.flight_id).where(*conditions))
+        )
+    counts = dict(db.execute(count_statement).all())
+
+    for page in _pages(flights, counts, args.page_size):
+        flight_ids = [flight.flight_id for flight in page if counts.get(flight.flight_id)]
+        by_flight = {}
+        if flight_ids:
+            rows = db.execute(boarding_pass_rows_statement(*flight_ids)).all()
+            by_flight = {flight_id: [tuple(row) for row in group]
+                         for flight_id, group in groupby(rows, key=attrgetter("flight_id"))}
+        for flight in page:
+            yield flight, by_flight.get(flight.flight_id, [])
+
+
+def run(args: argparse.Namespace, write, simulate=simulate_flight_json) -> int:
+    """Simula los vuelos en orden y entrega cada resultado de `simulate` a `write`."""
+    db = SessionLocal()
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    # Límite de vuelos en proceso para acotar la memoria
+    max_in_flight = max(1, args.workers) * 4
+    in_flight = deque()
+    written = 0
+    try:
+        # Todas las distribuciones de una vez: ninguna consulta por vuelo durante el recorrido
+        seat_layout_cache.preload(db)
+        for flight, rows in iter_flights(db, args):
+            layout = seat_layout_cache.get_or_load(db, flight.airplane_id)
+            if executor is None:
+                write(simulate(flight, layout, rows))
+                written += 1
+                continue
+            in_flight.append(executor.submit(simulate, flight, layout, rows))
+            # Escribir en orden de vuelo a medida que terminan los más antiguos
+            while len(in_flight) >= max_in_flight:
+                write(in_flight.popleft().result())
+                written += 1
+        while in_flight:
+            write(in_flight.popleft().result())
+            written += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        db.close()
+    return written
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.snapshot:
+        with SnapshotWriter(args.snapshot) as writer:
+            written = run(args, writer.add, simulate_flight_payload)
+        print(f"Snapshot escrito en {args.snapshot}", file=sys.stderr)
+    else:
+        output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        try:
+            written = run(args, lambda body: output.write(body + b"\n"))
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+    print(f"{written} vuelos simulados", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""El serializador directo (FlightPayload) produce los mismos bytes que el camino Pydantic de FastAPI."""
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.schemas.flight_schemas import FlightResponse, build_flight_data
+from app.schemas.serializers import FlightPayload
+from app.services.records import BoardingPassRecord, FlightRecord, PassengerRecord
+
+FLIGHT = FlightRecord(1, 1688207580, "Aeropuerto Internacional Arturo Merino Benítez, Chile",
+                      1688221980, "Aeropuerto Internacional Jorge Chávez, Perú", 2)
+
+BOARDING_PASSES = [
+    BoardingPassRecord(24, 47, 1, 15, 1, PassengerRecord(90, 983834822, "Marisol", 44, "México")),
+    BoardingPassRecord(31, 47, 1, 16, 1, PassengerRecord(91, 12345678, 'Ñandú "x" \\ 中   tab\t', 7, "Perú")),
+    # Sin asiento: seatId null
+    BoardingPassRecord(77, 52, 3, None, 1, PassengerRecord(12, 5, "Juan", 0, "Chile")),
+]
+
+
+def _fastapi_body(flight, boarding_passes) -> bytes:
+    response = FlightResponse(code=200, data=build_flight_data(flight, boarding_passes))
+    return JSONResponse(content=jsonable_encoder(response)).body
+
+
+def test_body_matches_fastapi_response():
+    payload = FlightPayload.from_boarding_passes(FLIGHT, BOARDING_PASSES)
+    assert payload.body() == _fastapi_body(FLIGHT, BOARDING_PASSES)
+
+
+def test_lazy_body_matches_fastapi_response():
+    payload = FlightPayload.from_boarding_passes(FLIGHT, BOARDING_PASSES, lazy=True)
+    assert payload.body() == _fastapi_body(FLIGHT, BOARDING_PASSES)
+
+
+def test_empty_flight_matches_fastapi_response():
+    assert FlightPayload.from_boarding_passes(FLIGHT, []).body() == _fastapi_body(FLIGHT, [])